@@ -47,7 +47,7 @@ class AuditLog(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to prevent updates on existing records."""
-        if self.pk and AuditLog.objects.filter(pk=self.pk).exists():
+        if not self._state.adding:
             raise ValueError("Audit logs are immutable and cannot be updated.")
         super().save(*args, **kwargs)
 
@@ -5,6 +5,10 @@ class AuditService:
     """
     Single entry point for writing audit logs.
     All mutations in the system should call this service.
+
+    Writes are synchronous on purpose: an entry queued for after the
+    response is lost if the worker dies, and the audit trail must not have
+    gaps. The extra INSERT is the price of that guarantee.
     """
 
     @staticmethod
@@ -17,9 +21,13 @@ class AuditService:
         user_agent: str = "",
         changes: dict = None,
         electronic_signature: str = "",
-    ) -> AuditLog:
-        """Create an immutable audit log entry."""
-        return AuditLog.objects.create(
+    ) -> None:
+        """
+        Write an immutable audit log entry.
+        The INSERT runs in the caller's transaction, so the entry commits
+        (or rolls back) together with the change it records.
+        """
+        AuditLog.objects.create(
             user_id=user_id,
             action=action,
             resource_type=resource_type,
@@ -29,3 +37,17 @@ class AuditService:
             changes=changes or {},
             electronic_signature=electronic_signature,
         )
+
+    @staticmethod
+    def log_actions(entries: list) -> None:
+        """
+        Write several audit entries (each a dict of log_action() arguments)
+        with a single bulk INSERT in the caller's transaction.
+        """
+        AuditLog.objects.bulk_create(
+            [
+                AuditLog(**{**entry, "changes": entry.get("changes") or {}})
+                for entry in entries
+            ],
+            batch_size=500,
+        )
@@ -0,0 +1,38 @@
+import uuid
+
+from django.db import transaction
+from django.test import TestCase
+
+from apps.audit.models.audit_log import AuditLog
+from apps.audit.services.audit_service import AuditService
+
+
+class AuditServiceTests(TestCase):
+    def log(self, resource_id: str) -> None:
+        AuditService.log_action(
+            user_id=str(uuid.uuid4()),
+            action="CREATE",
+            resource_type="MedicalRecord",
+            resource_id=resource_id,
+        )
+
+    def test_entry_is_written_immediately(self):
+        self.log("written")
+        self.assertTrue(AuditLog.objects.filter(resource_id="written").exists())
+
+    def test_entry_rolls_back_with_the_caller(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.log("rolled-back")
+                raise RuntimeError
+        self.assertFalse(AuditLog.objects.filter(resource_id="rolled-back").exists())
+
+    def test_bulk_entries_are_written(self):
+        AuditService.log_actions([
+            {"user_id": str(uuid.uuid4()), "action": "UPDATE",
+             "resource_type": "MedicalRecord", "resource_id": f"bulk-{i}"}
+            for i in range(3)
+        ])
+        self.assertEqual(
+            AuditLog.objects.filter(resource_id__startswith="bulk-").count(), 3,
+        )
@@ -0,0 +1,85 @@
+"""
+Deferred execution for work that should not hold up a request.
+
+Jobs are queued once the surrounding transaction commits and run on a
+small per-process thread pool. Set BACKGROUND_TASK_WORKERS to 0 to run
+them inline instead (useful for tests and management commands). Slow jobs
+go through run_in_queue() onto a separate pool per BACKGROUND_TASK_QUEUES
+entry; a size of 0 runs that queue inline too.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _queue_workers(queue: str) -> int:
+    if queue == DEFAULT_QUEUE:
+        return settings.BACKGROUND_TASK_WORKERS
+    return settings.BACKGROUND_TASK_QUEUES[queue]
+
+
+def _get_executor(queue: str) -> ThreadPoolExecutor:
+    executor = _executors.get(queue)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(queue)
+            if executor is None:
+                executor = _executors[queue] = ThreadPoolExecutor(
+                    max_workers=_queue_workers(queue),
+                    thread_name_prefix=f"background-{queue}",
+                )
+    return executor
+
+
+def _run(func, args, kwargs) -> None:
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__qualname__)
+
+
+def _run_in_worker(func, args, kwargs) -> None:
+    # Worker threads own their DB connections; drop them when the job ends.
+    close_old_connections()
+    try:
+        _run(func, args, kwargs)
+    finally:
+        close_old_connections()
+
+
+def _submit_on_commit(queue: str, func, args, kwargs) -> None:
+    def submit():
+        if _queue_workers(queue) <= 0:
+            _run(func, args, kwargs)
+        else:
+            _get_executor(queue).submit(_run_in_worker, func, args, kwargs)
+
+    transaction.on_commit(submit)
+
+
+def run_in_background(func, *args, **kwargs) -> None:
+    """
+    Schedule ``func(*args, **kwargs)`` to run after the current
+    transaction commits.
+    """
+    _submit_on_commit(DEFAULT_QUEUE, func, args, kwargs)
+
+
+def run_in_queue(queue: str, func, *args, **kwargs) -> None:
+    """
+    Like run_in_background(), but on the named queue's own thread pool
+    (sized by BACKGROUND_TASK_QUEUES), so slow jobs there cannot hold up
+    the default pool.
+    """
+    _submit_on_commit(queue, func, args, kwargs)
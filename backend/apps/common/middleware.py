@@ -0,0 +1,18 @@
+class ClientContextMiddleware:
+    """
+    Read the client's address and user agent once per request and expose
+    them as ``request.client_ip`` and ``request.user_agent`` for audit
+    logging. The user agent is truncated to bound what gets logged.
+    """
+
+    USER_AGENT_MAX_LENGTH = 512
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        meta = request.META
+        request.client_ip = meta.get("REMOTE_ADDR")
+        user_agent = meta.get("HTTP_USER_AGENT", "")
+        request.user_agent = user_agent[: self.USER_AGENT_MAX_LENGTH]
+        return self.get_response(request)
@@ -1,9 +1,24 @@
+import os
+import time
 import uuid
 
 from django.conf import settings
 from django.db import models
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits. New keys land at the right edge of the
+    primary key index instead of at random pages.
+    """
+    ms = time.time_ns() // 1_000_000
+    value = (ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant
+    return uuid.UUID(int=value)
+
+
 class BaseModel(models.Model):
     """
     Abstract base model providing UUID primary key, timestamps,
@@ -0,0 +1,40 @@
+import copy
+
+from rest_framework import serializers
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer's fields once per class instead of once per instance.
+
+    ModelSerializer introspects the model to construct every field each
+    time a serializer is instantiated. This mixin keeps the first result
+    as a template and hands each instance its own copies.
+
+    Also accepts a ``fields`` keyword argument to render only a subset
+    of the declared fields, e.g. ``MySerializer(obj, fields=["id", "title"])``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._only_fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        cls = type(self)
+        template = cls.__dict__.get("_fields_template")
+        if template is None:
+            template = super().get_fields()
+            cls._fields_template = template
+
+        fields = {}
+        for name, field in template.items():
+            if self._only_fields is not None and name not in self._only_fields:
+                continue
+            # Nested serializers and fields with a child hold bound state of
+            # their own, so they need a full copy; the rest share everything
+            # but the attributes set when binding.
+            if isinstance(field, serializers.BaseSerializer) or hasattr(field, "child"):
+                fields[name] = copy.deepcopy(field)
+            else:
+                fields[name] = copy.copy(field)
+        return fields
@@ -0,0 +1,39 @@
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.audit.models.audit_log import AuditLog
+from apps.common.middleware import ClientContextMiddleware
+from apps.users.models import User
+
+
+class ClientContextMiddlewareTests(TestCase):
+    def run_middleware(self, **meta):
+        request = RequestFactory().get("/", **meta)
+        ClientContextMiddleware(lambda r: None)(request)
+        return request
+
+    def test_client_address_and_user_agent_are_exposed(self):
+        request = self.run_middleware(REMOTE_ADDR="203.0.113.7", HTTP_USER_AGENT="curl")
+        self.assertEqual(request.client_ip, "203.0.113.7")
+        self.assertEqual(request.user_agent, "curl")
+
+    def test_user_agent_is_truncated_and_defaults_to_empty(self):
+        limit = ClientContextMiddleware.USER_AGENT_MAX_LENGTH
+        request = self.run_middleware(HTTP_USER_AGENT="x" * (limit + 100))
+        self.assertEqual(len(request.user_agent), limit)
+        self.assertEqual(self.run_middleware().user_agent, "")
+
+    @override_settings(BACKGROUND_TASK_WORKERS=0)
+    def test_views_audit_with_the_request_context(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("p@example.com", "pw"))
+        response = client.post(
+            "/api/v1/triage/sessions/",
+            {"symptoms_text": "cough"},
+            format="json",
+            REMOTE_ADDR="203.0.113.7",
+            HTTP_USER_AGENT="TriageApp/1.0",
+        )
+        entry = AuditLog.objects.get(resource_id=response.json()["id"])
+        self.assertEqual(entry.ip_address, "203.0.113.7")
+        self.assertEqual(entry.user_agent, "TriageApp/1.0")
@@ -0,0 +1,56 @@
+import json
+import uuid
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.common.renderers import OrjsonRenderer
+from apps.users.models import User
+
+
+class OrjsonRendererTests(TestCase):
+    def test_output_matches_drf_json_renderer(self):
+        data = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "amount": Decimal("12.50"),
+            "label": gettext_lazy("Active"),
+            "scores": {1: 0.5},
+            "items": [1, "two", None, True],
+        }
+        self.assertEqual(
+            json.loads(OrjsonRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_none_renders_an_empty_body(self):
+        self.assertEqual(OrjsonRenderer().render(None), b"")
+
+    def test_indent_is_honoured(self):
+        body = OrjsonRenderer().render(
+            {"a": 1}, "application/json; indent=4", {},
+        )
+        self.assertEqual(body, b'{\n  "a": 1\n}')
+
+
+class OrjsonParserTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("p@example.com", "pw"))
+
+    def post(self, body: bytes):
+        return self.client.generic(
+            "POST", "/api/v1/triage/sessions/", body, content_type="application/json",
+        )
+
+    def test_json_body_is_parsed(self):
+        response = self.post(b'{"symptoms_text": "sore throat"}')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["symptoms_text"], "sore throat")
+
+    def test_malformed_body_is_a_400(self):
+        response = self.post(b'{"symptoms_text": ')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
@@ -41,7 +41,7 @@ class ConsentListCreateView(APIView):
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
         if x_forwarded_for:
             return x_forwarded_for.split(",")[0].strip()
-        return request.META.get("REMOTE_ADDR")
+        return request.client_ip
 
 
 class ConsentRevokeView(APIView):
@@ -1,10 +1,51 @@
+import os
+
 from rest_framework import serializers
 
+from apps.common.serializers import CachedFieldsMixin
 from apps.records.models.medical_record import MedicalDocument, MedicalRecord
+from apps.records.services.record_service import RecordService
+
+# Valid choice values, checked with a set lookup in the validate_<field>
+# hooks below instead of building ChoiceFields per request.
+_RECORD_TYPES = frozenset(MedicalRecord.RecordType.values)
+_RECORD_STATUSES = frozenset(MedicalRecord.Status.values)
+_SEVERITIES = frozenset(MedicalRecord.Severity.values)
+_DOCUMENT_TYPES = frozenset(MedicalDocument.DocumentType.values)
+
+
+def _validate_choice(value, choices):
+    if value not in choices:
+        raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+    return value
+
+
+class DeferredField(serializers.Field):
+    """
+    Read-only stand-in for a column deferred on the queryset.
+    Renders a fixed empty value without touching the instance, so the
+    deferred column is never loaded (or decrypted) row by row.
+    """
+
+    def __init__(self, empty, **kwargs):
+        self.empty = empty
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
 
+    def get_attribute(self, instance):
+        return self.empty
 
-class MedicalRecordSerializer(serializers.ModelSerializer):
-    documents = serializers.SerializerMethodField()
+    def to_representation(self, value):
+        return value
+
+
+class MedicalRecordSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    # Filled in by setup_eager_loading() before serialization.
+    documents = serializers.ListField(
+        source="_documents_cache",
+        child=serializers.ReadOnlyField(),
+        read_only=True,
+    )
 
     class Meta:
         model = MedicalRecord
@@ -24,45 +65,55 @@ class MedicalRecordSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "documents", "created_at", "updated_at"]
 
-    def get_documents(self, obj):
-        docs = getattr(obj, "documents", None)
-        if docs is None:
-            return []
-        return MedicalDocumentSerializer(docs.filter(is_deleted=False), many=True).data
+    @classmethod
+    def setup_eager_loading(cls, records) -> None:
+        """
+        Batch-load, for a whole page of records, the data this serializer
+        reads beyond each record's own columns.
+        """
+        RecordService.attach_documents(records)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_description", True):
+            # Columns deferred by the list view unless ?include_description=1.
+            fields["description"] = DeferredField(empty="")
+            fields["data"] = DeferredField(empty={})
+        return fields
+
+
+class RecordChoicesMixin:
+    """validate_<field> hooks for the record choice fields."""
 
+    def validate_record_type(self, value):
+        return _validate_choice(value, _RECORD_TYPES)
 
-class CreateRecordSerializer(serializers.Serializer):
-    record_type = serializers.ChoiceField(choices=MedicalRecord.RecordType.choices)
+    def validate_status(self, value):
+        return _validate_choice(value, _RECORD_STATUSES)
+
+    def validate_severity(self, value):
+        return _validate_choice(value, _SEVERITIES) if value else value
+
+
+class CreateRecordSerializer(RecordChoicesMixin, serializers.Serializer):
+    record_type = serializers.CharField()
     title = serializers.CharField(max_length=255)
     description = serializers.CharField(required=False, allow_blank=True, default="")
     date_recorded = serializers.DateField(required=False, allow_null=True, default=None)
     provider = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
-    status = serializers.ChoiceField(
-        choices=MedicalRecord.Status.choices,
-        required=False,
-        default="ACTIVE",
-    )
-    severity = serializers.ChoiceField(
-        choices=MedicalRecord.Severity.choices,
-        required=False,
-        allow_blank=True,
-        default="",
-    )
+    status = serializers.CharField(required=False, default="ACTIVE")
+    severity = serializers.CharField(required=False, allow_blank=True, default="")
     data = serializers.JSONField(required=False, default=dict)
 
 
-class UpdateRecordSerializer(serializers.Serializer):
-    record_type = serializers.ChoiceField(choices=MedicalRecord.RecordType.choices, required=False)
+class UpdateRecordSerializer(RecordChoicesMixin, serializers.Serializer):
+    record_type = serializers.CharField(required=False)
     title = serializers.CharField(max_length=255, required=False)
     description = serializers.CharField(required=False, allow_blank=True)
     date_recorded = serializers.DateField(required=False, allow_null=True)
     provider = serializers.CharField(max_length=255, required=False, allow_blank=True)
-    status = serializers.ChoiceField(choices=MedicalRecord.Status.choices, required=False)
-    severity = serializers.ChoiceField(
-        choices=MedicalRecord.Severity.choices,
-        required=False,
-        allow_blank=True,
-    )
+    status = serializers.CharField(required=False)
+    severity = serializers.CharField(required=False, allow_blank=True)
     data = serializers.JSONField(required=False)
 
 
@@ -75,15 +126,33 @@ class MedicalDocumentSerializer(serializers.ModelSerializer):
             "original_filename",
             "file_size",
             "extracted_text",
+            "extraction_status",
             "created_at",
         ]
         read_only_fields = fields
 
 
 class UploadDocumentSerializer(serializers.Serializer):
-    document_type = serializers.ChoiceField(
-        choices=MedicalDocument.DocumentType.choices,
-        required=False,
-        default="OTHER",
-    )
+    document_type = serializers.CharField(required=False, default="OTHER")
     record_id = serializers.UUIDField(required=False, allow_null=True, default=None)
+
+    def validate_document_type(self, value):
+        return _validate_choice(value, _DOCUMENT_TYPES)
+
+
+class StartUploadSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    total_size = serializers.IntegerField(min_value=1)
+    document_type = serializers.CharField(required=False, default="OTHER")
+    record_id = serializers.UUIDField(required=False, allow_null=True, default=None)
+
+    def validate_filename(self, value):
+        # Keep only the final path component; browsers on Windows may send
+        # backslash-separated paths.
+        name = os.path.basename(value.replace("\\", "/")).strip()
+        if name in ("", ".", ".."):
+            raise serializers.ValidationError("Enter a valid file name.")
+        return name
+
+    def validate_document_type(self, value):
+        return _validate_choice(value, _DOCUMENT_TYPES)
@@ -1,6 +1,9 @@
 from django.urls import path
 
 from apps.records.api.views import (
+    DocumentUploadChunkView,
+    DocumentUploadFinalizeView,
+    DocumentUploadStartView,
     MedicalContextView,
     MedicalDocumentListView,
     MedicalDocumentUploadView,
@@ -13,5 +16,20 @@ urlpatterns = [
     path("<uuid:record_id>/", MedicalRecordDetailView.as_view(), name="record-detail"),
     path("documents/", MedicalDocumentListView.as_view(), name="documents-list"),
     path("documents/upload/", MedicalDocumentUploadView.as_view(), name="document-upload"),
+    path(
+        "documents/upload/init/",
+        DocumentUploadStartView.as_view(),
+        name="document-upload-init",
+    ),
+    path(
+        "documents/upload/<uuid:upload_id>/",
+        DocumentUploadChunkView.as_view(),
+        name="document-upload-chunk",
+    ),
+    path(
+        "documents/upload/<uuid:upload_id>/finalize/",
+        DocumentUploadFinalizeView.as_view(),
+        name="document-upload-finalize",
+    ),
     path("context/", MedicalContextView.as_view(), name="medical-context"),
 ]
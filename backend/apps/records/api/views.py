@@ -1,3 +1,5 @@
+import re
+
 from rest_framework import generics, status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
@@ -8,11 +10,19 @@ from apps.records.api.serializers import (
     CreateRecordSerializer,
     MedicalDocumentSerializer,
     MedicalRecordSerializer,
+    StartUploadSerializer,
     UpdateRecordSerializer,
     UploadDocumentSerializer,
 )
 from apps.records.models.medical_record import MedicalRecord
-from apps.records.services.record_service import RecordService
+from apps.records.services.record_service import (
+    DOCUMENT_SUMMARY_FIELDS,
+    MAX_DOCUMENT_SIZE,
+    UPLOAD_CHUNK_SIZE,
+    RecordService,
+)
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
 
 
 class MedicalRecordListCreateView(generics.ListCreateAPIView):
@@ -24,9 +34,32 @@ class MedicalRecordListCreateView(generics.ListCreateAPIView):
     serializer_class = MedicalRecordSerializer
     permission_classes = [IsAuthenticated]
 
+    def include_description(self) -> bool:
+        return self.request.query_params.get("include_description") in ("1", "true")
+
     def get_queryset(self):
         record_type = self.request.query_params.get("type")
-        return RecordService.get_user_records(self.request.user, record_type)
+        qs = RecordService.get_user_records(self.request.user, record_type)
+        if not self.include_description():
+            # Skip loading (and decrypting) the heavy columns for list views.
+            qs = qs.defer("description", "data")
+        return qs
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include_description"] = self.include_description()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        records = list(page if page is not None else queryset)
+        MedicalRecordSerializer.setup_eager_loading(records)
+
+        serializer = self.get_serializer(records, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def create(self, request, *args, **kwargs):
         serializer = CreateRecordSerializer(data=request.data)
@@ -43,9 +76,11 @@ class MedicalRecordListCreateView(generics.ListCreateAPIView):
             status=data.get("status", "ACTIVE"),
             severity=data.get("severity", ""),
             data=data.get("data", {}),
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
+        # A brand-new record has no documents; skip the lookup query.
+        record._documents_cache = []
 
         return Response(
             MedicalRecordSerializer(record).data,
@@ -69,33 +104,44 @@ class MedicalRecordDetailView(APIView):
         return Response(MedicalRecordSerializer(record).data)
 
     def patch(self, request, record_id):
-        record = RecordService.get_record_detail(str(record_id), request.user)
-        if not record:
-            return Response({"error": "Record not found."}, status=status.HTTP_404_NOT_FOUND)
+        # A missing record is a 404 whatever the payload looks like.
+        if not RecordService.record_exists(str(record_id), request.user):
+            return Response(
+                {"error": "Record not found."}, status=status.HTTP_404_NOT_FOUND,
+            )
 
         serializer = UpdateRecordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         updated = RecordService.update_record(
-            record=record,
+            record_id=str(record_id),
             user=request.user,
             updates=serializer.validated_data,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
-        return Response(MedicalRecordSerializer(updated).data)
+        if not updated:
+            return Response(
+                {"error": "Record not found."}, status=status.HTTP_404_NOT_FOUND,
+            )
 
-    def delete(self, request, record_id):
-        record = RecordService.get_record_detail(str(record_id), request.user)
-        if not record:
-            return Response({"error": "Record not found."}, status=status.HTTP_404_NOT_FOUND)
+        # Echo back only what changed, so untouched (encrypted) columns are
+        # not re-read for the response.
+        fields = ["id", *serializer.validated_data, "updated_at"]
+        return Response(MedicalRecordSerializer(updated, fields=fields).data)
 
-        RecordService.soft_delete_record(
-            record=record,
+    def delete(self, request, record_id):
+        deleted = RecordService.soft_delete_record(
+            record_id=str(record_id),
             user=request.user,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
+        if not deleted:
+            return Response(
+                {"error": "Record not found."}, status=status.HTTP_404_NOT_FOUND,
+            )
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -113,7 +159,7 @@ class MedicalDocumentUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if file.size > 20 * 1024 * 1024:
+        if file.size > MAX_DOCUMENT_SIZE:
             return Response(
                 {"error": "File must be smaller than 20MB."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -134,10 +180,119 @@ class MedicalDocumentUploadView(APIView):
             file=file,
             document_type=data.get("document_type", "OTHER"),
             record=record,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
+        )
+
+        return Response(
+            MedicalDocumentSerializer(doc).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class DocumentUploadStartView(APIView):
+    """
+    POST — start a chunked upload. Returns an ``upload_id`` that chunks
+    are PATCHed to before finalizing, and the largest ``chunk_size``
+    accepted per PATCH.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = StartUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        record = None
+        if data.get("record_id"):
+            record = MedicalRecord.objects.filter(
+                id=data["record_id"], user=request.user, is_deleted=False,
+            ).first()
+
+        try:
+            upload = RecordService.start_upload(
+                user=request.user,
+                filename=data["filename"],
+                total_size=data["total_size"],
+                document_type=data.get("document_type", "OTHER"),
+                record=record,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "upload_id": str(upload.id),
+                "total_size": upload.total_size,
+                "chunk_size": UPLOAD_CHUNK_SIZE,
+            },
+            status=status.HTTP_201_CREATED,
         )
 
+
+class DocumentUploadChunkView(APIView):
+    """
+    PATCH — append one chunk. The raw request body holds the bytes and
+    ``Content-Range: bytes <start>-<end>/<total>`` says where they go.
+    Chunks can be retried or sent in parallel, and hold at most
+    ``chunk_size`` bytes.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, upload_id):
+        upload = RecordService.get_open_upload(str(upload_id), request.user)
+        if not upload:
+            return Response(
+                {"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND,
+            )
+
+        match = CONTENT_RANGE_RE.match(request.headers.get("Content-Range", ""))
+        if not match:
+            return Response(
+                {"error": "A Content-Range header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end, total = (int(g) for g in match.groups())
+        # Checked before touching request.body, which Django refuses to read
+        # past DATA_UPLOAD_MAX_MEMORY_SIZE.
+        if end - start + 1 > UPLOAD_CHUNK_SIZE:
+            return Response(
+                {"error": f"Chunks must be at most {UPLOAD_CHUNK_SIZE} bytes."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        content = request.body
+        if total != upload.total_size or end - start + 1 != len(content):
+            return Response(
+                {"error": "Content-Range does not match the chunk or upload size."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            received = RecordService.append_upload_chunk(upload, start, content)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"upload_id": str(upload.id), "received_bytes": received})
+
+
+class DocumentUploadFinalizeView(APIView):
+    """POST — assemble the uploaded chunks into a document."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        try:
+            doc = RecordService.finalize_upload(
+                upload_id=str(upload_id),
+                user=request.user,
+                ip_address=request.client_ip,
+                user_agent=request.user_agent,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         return Response(
             MedicalDocumentSerializer(doc).data,
             status=status.HTTP_201_CREATED,
@@ -153,6 +308,15 @@ class MedicalDocumentListView(generics.ListAPIView):
     def get_queryset(self):
         return RecordService.get_user_documents(self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        # Read-only scalar columns: render the rows as plain dicts and skip
+        # the per-field ModelSerializer machinery.
+        rows = self.get_queryset().values(*DOCUMENT_SUMMARY_FIELDS)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+        return Response(list(rows))
+
 
 class MedicalContextView(APIView):
     """GET — return assembled medical context for AI prompt."""
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.records.services.record_service import RecordService
+
+
+class Command(BaseCommand):
+    help = 'Deletes abandoned chunked document uploads and their stored chunks'
+
+    def handle(self, *args, **options):
+        expired = RecordService.expire_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} upload(s)'))
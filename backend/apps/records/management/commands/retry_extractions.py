@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.records.services.record_service import EXTRACTION_RETRY_AFTER, RecordService
+
+
+class Command(BaseCommand):
+    help = 'Re-runs text extraction for documents whose background job was lost'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=int(EXTRACTION_RETRY_AFTER.total_seconds() // 60),
+            help='Minutes a document must have been pending (default: %(default)s)',
+        )
+
+    def handle(self, *args, **options):
+        retried = RecordService.retry_stale_extractions(
+            older_than=timedelta(minutes=options['older_than']),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Retried extraction for {retried} document(s)')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicaldocument',
+            name='extraction_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='DONE', help_text='Progress of background text extraction.', max_length=20),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0002_medicaldocument_extraction_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'record_type', '-date_recorded'], name='mr_user_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-date_recorded', '-created_at'], name='mr_user_date_created_idx'),
+        ),
+    ]
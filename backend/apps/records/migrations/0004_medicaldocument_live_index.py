@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0003_medicalrecord_live_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicaldocument',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-created_at'], name='md_user_created_idx'),
+        ),
+    ]
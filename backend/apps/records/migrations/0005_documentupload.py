@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:46
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0004_medicaldocument_live_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False)),
+                ('original_filename', models.CharField(max_length=255)),
+                ('document_type', models.CharField(choices=[('LAB_REPORT', 'Lab Report'), ('DISCHARGE_SUMMARY', 'Discharge Summary'), ('PRESCRIPTION', 'Prescription'), ('IMAGING', 'Imaging Report'), ('REFERRAL', 'Referral Letter'), ('INSURANCE', 'Insurance Document'), ('OTHER', 'Other')], default='OTHER', max_length=30)),
+                ('total_size', models.PositiveIntegerField(help_text='Declared file size in bytes.')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('document', models.OneToOneField(blank=True, help_text='Set once the upload has been finalized.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='records.medicaldocument')),
+                ('record', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='records.medicalrecord')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
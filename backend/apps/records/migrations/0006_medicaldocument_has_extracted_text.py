@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_has_extracted_text(apps, schema_editor):
+    # extracted_text is encrypted, so the check has to happen in Python.
+    MedicalDocument = apps.get_model("records", "MedicalDocument")
+    rows = MedicalDocument.objects.values_list("id", "extracted_text").iterator()
+    ids = [pk for pk, text in rows if text]
+    MedicalDocument.objects.filter(id__in=ids).update(has_extracted_text=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0005_documentupload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicaldocument',
+            name='has_extracted_text',
+            field=models.BooleanField(default=False, help_text='Whether extracted_text is non-empty (the encrypted column cannot be filtered on).'),
+        ),
+        migrations.RunPython(backfill_has_extracted_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='medicaldocument',
+            index=models.Index(condition=models.Q(('has_extracted_text', True), ('is_deleted', False)), fields=['user', '-created_at'], name='md_user_text_idx'),
+        ),
+    ]
@@ -1 +1,5 @@
-from apps.records.models.medical_record import MedicalDocument, MedicalRecord
+from apps.records.models.medical_record import (
+    DocumentUpload,
+    MedicalDocument,
+    MedicalRecord,
+)
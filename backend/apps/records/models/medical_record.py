@@ -1,7 +1,9 @@
 import uuid
+from pathlib import Path
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 from apps.common.encryption import EncryptedTextField
 from apps.common.models.base import BaseModel
@@ -79,6 +81,18 @@ class MedicalRecord(BaseModel):
         indexes = [
             models.Index(fields=["user", "record_type"]),
             models.Index(fields=["user", "-created_at"]),
+            # Partial indexes over live rows, matching the list and
+            # AI-context queries (filter + ORDER BY).
+            models.Index(
+                fields=["user", "record_type", "-date_recorded"],
+                condition=Q(is_deleted=False),
+                name="mr_user_type_date_idx",
+            ),
+            models.Index(
+                fields=["user", "-date_recorded", "-created_at"],
+                condition=Q(is_deleted=False),
+                name="mr_user_date_created_idx",
+            ),
         ]
 
     def __str__(self):
@@ -100,6 +114,11 @@ class MedicalDocument(BaseModel):
         INSURANCE = "INSURANCE", "Insurance Document"
         OTHER = "OTHER", "Other"
 
+    class ExtractionStatus(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -125,6 +144,19 @@ class MedicalDocument(BaseModel):
         default="",
         help_text="Text extracted from the document for AI context.",
     )
+    extraction_status = models.CharField(
+        max_length=20,
+        choices=ExtractionStatus.choices,
+        default=ExtractionStatus.DONE,
+        help_text="Progress of background text extraction.",
+    )
+    has_extracted_text = models.BooleanField(
+        default=False,
+        help_text=(
+            "Whether extracted_text is non-empty "
+            "(the encrypted column cannot be filtered on)."
+        ),
+    )
     file_size = models.PositiveIntegerField(
         default=0,
         help_text="File size in bytes.",
@@ -132,6 +164,62 @@ class MedicalDocument(BaseModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=Q(is_deleted=False),
+                name="md_user_created_idx",
+            ),
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=Q(is_deleted=False, has_extracted_text=True),
+                name="md_user_text_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.document_type}: {self.original_filename}"
+
+
+class DocumentUpload(BaseModel):
+    """
+    A resumable, chunked document upload in progress.
+    Chunks are staged on the local filesystem (see ``chunk_dir``) until
+    the upload is finalized into a MedicalDocument.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="document_uploads",
+    )
+    record = models.ForeignKey(
+        MedicalRecord,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    original_filename = models.CharField(max_length=255)
+    document_type = models.CharField(
+        max_length=30,
+        choices=MedicalDocument.DocumentType.choices,
+        default=MedicalDocument.DocumentType.OTHER,
+    )
+    total_size = models.PositiveIntegerField(help_text="Declared file size in bytes.")
+    document = models.OneToOneField(
+        MedicalDocument,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Set once the upload has been finalized.",
+    )
+
+    def __str__(self):
+        return f"Upload {self.original_filename} ({self.total_size} bytes)"
+
+    @property
+    def chunk_dir(self) -> Path:
+        """Local directory the chunks are staged in until finalize."""
+        return Path(settings.MEDIA_ROOT) / "records" / "uploads" / str(self.id)
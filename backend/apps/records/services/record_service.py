@@ -1,13 +1,56 @@
 import io
 import logging
-
+import os
+import re
+import shutil
+import tempfile
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
 from django.db import transaction
+from django.utils import timezone
 
 from apps.audit.services.audit_service import AuditService
-from apps.records.models.medical_record import MedicalDocument, MedicalRecord
+from apps.common.background import run_in_background
+from apps.records.models.medical_record import (
+    DocumentUpload,
+    MedicalDocument,
+    MedicalRecord,
+)
 
 logger = logging.getLogger(__name__)
 
+MAX_DOCUMENT_SIZE = 20 * 1024 * 1024
+MAX_CONTEXT_CHARS = 10000  # Cap on the assembled AI context
+
+# Documents still PENDING this long after upload lost their extraction job.
+EXTRACTION_RETRY_AFTER = timedelta(minutes=10)
+
+# Chunked uploads. Chunks are staged on the local filesystem under
+# MEDIA_ROOT (see DocumentUpload.chunk_dir); only the assembled file goes
+# through the storage backend.
+MAX_OPEN_UPLOADS = 5  # Per user
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # Below Django's 2.5MB request body cap
+UPLOAD_EXPIRY = timedelta(hours=24)  # Since the last chunk
+CHUNK_NAME_RE = re.compile(r"^(\d{12})-(\d{12})$")
+
+# Document fields rendered alongside a record (mirrors MedicalDocumentSerializer).
+DOCUMENT_SUMMARY_FIELDS = (
+    "id",
+    "document_type",
+    "original_filename",
+    "file_size",
+    "extracted_text",
+    "extraction_status",
+    "created_at",
+)
+
+# Choice labels for the AI context, resolved once instead of per row.
+_RECORD_TYPE_LABEL = dict(MedicalRecord.RecordType.choices)
+_DOC_TYPE_LABEL = dict(MedicalDocument.DocumentType.choices)
+
 
 class RecordService:
     """Business logic for medical records and documents."""
@@ -56,25 +99,86 @@ class RecordService:
         return record
 
     @staticmethod
+    @transaction.atomic
+    def bulk_create_records(
+        user,
+        items: list,
+        ip_address: str = None,
+        user_agent: str = "",
+    ) -> list:
+        """
+        Create many records at once (e.g. from a FHIR bundle import).
+        Each item takes the same keys as create_record(); records are
+        inserted in batches and audited with one bulk write.
+        """
+        records = MedicalRecord.objects.bulk_create(
+            [
+                MedicalRecord(
+                    user=user,
+                    record_type=item["record_type"],
+                    title=item["title"],
+                    description=item.get("description", ""),
+                    date_recorded=item.get("date_recorded"),
+                    provider=item.get("provider", ""),
+                    status=item.get("status", "ACTIVE"),
+                    severity=item.get("severity", ""),
+                    data=item.get("data") or {},
+                    created_by=user,
+                )
+                for item in items
+            ],
+            batch_size=500,
+        )
+
+        AuditService.log_actions([
+            {
+                "user_id": str(user.id),
+                "action": "CREATE",
+                "resource_type": "MedicalRecord",
+                "resource_id": str(record.id),
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "changes": {"record_type": record.record_type, "title": record.title},
+            }
+            for record in records
+        ])
+
+        return records
+
+    @staticmethod
+    @transaction.atomic
     def update_record(
-        record: MedicalRecord,
+        record_id: str,
         user,
         updates: dict,
         ip_address: str = None,
         user_agent: str = "",
-    ) -> MedicalRecord:
+    ):
+        """
+        Apply ``updates`` to one of the user's records.
+        The record is read with SELECT ... FOR UPDATE and written in the
+        same transaction. Returns None if no such record exists.
+        """
+        record = (
+            MedicalRecord.objects.select_for_update()
+            .filter(id=record_id, user=user, is_deleted=False)
+            .first()
+        )
+        if not record:
+            return None
+
         allowed_fields = [
             "title", "description", "record_type", "date_recorded",
             "provider", "status", "severity", "data",
         ]
-        changed = {}
-        for field in allowed_fields:
-            if field in updates:
-                setattr(record, field, updates[field])
-                changed[field] = str(updates[field])
+        changed = {f: updates[f] for f in allowed_fields if f in updates}
+        for field, value in changed.items():
+            setattr(record, field, value)
 
+        # Only write the touched columns; a full save() would re-encrypt
+        # description on every update.
         record.updated_by = user
-        record.save()
+        record.save(update_fields=[*changed, "updated_by", "updated_at"])
 
         AuditService.log_action(
             user_id=str(user.id),
@@ -83,29 +187,37 @@ class RecordService:
             resource_id=str(record.id),
             ip_address=ip_address,
             user_agent=user_agent,
-            changes=changed,
+            changes={field: str(value) for field, value in changed.items()},
         )
 
         return record
 
     @staticmethod
     def soft_delete_record(
-        record: MedicalRecord,
+        record_id: str,
         user,
         ip_address: str = None,
         user_agent: str = "",
-    ) -> None:
-        record.is_deleted = True
-        record.save(update_fields=["is_deleted", "updated_at"])
+    ) -> bool:
+        """
+        Soft-delete one of the user's records with a single UPDATE.
+        Returns False if no such record exists.
+        """
+        deleted = MedicalRecord.objects.filter(
+            id=record_id, user=user, is_deleted=False,
+        ).update(is_deleted=True, updated_at=timezone.now())
+        if not deleted:
+            return False
 
         AuditService.log_action(
             user_id=str(user.id),
             action="DELETE",
             resource_type="MedicalRecord",
-            resource_id=str(record.id),
+            resource_id=str(record_id),
             ip_address=ip_address,
             user_agent=user_agent,
         )
+        return True
 
     @staticmethod
     def get_user_records(user, record_type: str = None):
@@ -114,15 +226,35 @@ class RecordService:
             qs = qs.filter(record_type=record_type)
         return qs.order_by("-date_recorded", "-created_at")
 
+    @staticmethod
+    def record_exists(record_id: str, user) -> bool:
+        return MedicalRecord.objects.filter(
+            id=record_id, user=user, is_deleted=False,
+        ).exists()
+
     @staticmethod
     def get_record_detail(record_id: str, user):
-        return (
-            MedicalRecord.objects.filter(
-                id=record_id, user=user, is_deleted=False,
-            )
-            .prefetch_related("documents")
-            .first()
-        )
+        record = MedicalRecord.objects.filter(
+            id=record_id, user=user, is_deleted=False,
+        ).first()
+        if record:
+            RecordService.attach_documents([record])
+        return record
+
+    @staticmethod
+    def attach_documents(records) -> None:
+        """
+        Load the active documents of ``records`` in a single query and
+        attach them as plain dicts on ``record._documents_cache``.
+        """
+        documents_by_record = defaultdict(list)
+        rows = MedicalDocument.objects.filter(
+            record_id__in=[r.id for r in records], is_deleted=False,
+        ).order_by("-created_at").values("record_id", *DOCUMENT_SUMMARY_FIELDS)
+        for row in rows:
+            documents_by_record[row.pop("record_id")].append(row)
+        for record in records:
+            record._documents_cache = documents_by_record[record.id]
 
     # ---------------------------------------------------------------
     # Document Upload + PDF Extraction
@@ -138,9 +270,11 @@ class RecordService:
         ip_address: str = None,
         user_agent: str = "",
     ) -> MedicalDocument:
-        extracted_text = ""
-        if file.name.lower().endswith(".pdf"):
-            extracted_text = RecordService._extract_pdf_text(file)
+        """
+        Store an uploaded document. PDF text extraction is deferred to a
+        background job so the upload returns without waiting on the parser.
+        """
+        is_pdf = file.name.lower().endswith(".pdf")
 
         doc = MedicalDocument.objects.create(
             user=user,
@@ -148,11 +282,18 @@ class RecordService:
             file=file,
             original_filename=file.name,
             document_type=document_type,
-            extracted_text=extracted_text,
+            extraction_status=(
+                MedicalDocument.ExtractionStatus.PENDING
+                if is_pdf
+                else MedicalDocument.ExtractionStatus.DONE
+            ),
             file_size=file.size,
             created_by=user,
         )
 
+        if is_pdf:
+            run_in_background(RecordService.extract_document_text, doc.id)
+
         AuditService.log_action(
             user_id=str(user.id),
             action="CREATE",
@@ -163,36 +304,283 @@ class RecordService:
             changes={
                 "filename": file.name,
                 "document_type": document_type,
-                "extracted_length": len(extracted_text),
             },
         )
 
         return doc
 
     @staticmethod
-    def _extract_pdf_text(file) -> str:
-        """Extract text from a PDF file using PyPDF2."""
+    def extract_document_text(document_id) -> None:
+        """Extract a stored PDF's text and persist it with a single UPDATE."""
+        doc = MedicalDocument.objects.filter(pk=document_id).only("file").first()
+        if not doc:
+            return
+
         try:
-            from PyPDF2 import PdfReader
+            with doc.file.open("rb") as f:
+                extracted_text = RecordService._extract_pdf_text(f)
+            extraction_status = MedicalDocument.ExtractionStatus.DONE
+        except Exception as e:
+            logger.warning("Text extraction failed for document %s: %s", document_id, e)
+            extracted_text = ""
+            extraction_status = MedicalDocument.ExtractionStatus.FAILED
+
+        MedicalDocument.objects.filter(pk=document_id).update(
+            extracted_text=extracted_text,
+            has_extracted_text=bool(extracted_text),
+            extraction_status=extraction_status,
+        )
+
+    @staticmethod
+    def retry_stale_extractions(
+        older_than: timedelta = EXTRACTION_RETRY_AFTER,
+    ) -> int:
+        """
+        Re-run text extraction, inline, for documents still PENDING longer
+        than ``older_than`` after upload: their background job was lost
+        with the worker that held it. Returns how many were retried.
+        """
+        stale_ids = list(
+            MedicalDocument.objects.filter(
+                extraction_status=MedicalDocument.ExtractionStatus.PENDING,
+                created_at__lt=timezone.now() - older_than,
+                is_deleted=False,
+            ).values_list("id", flat=True)
+        )
+        for document_id in stale_ids:
+            RecordService.extract_document_text(document_id)
+        return len(stale_ids)
+
+    @staticmethod
+    def _extract_pdf_text(file) -> str:
+        """
+        Extract text from a PDF file using pypdfium2 (PDFium). Parser
+        errors propagate so the caller can record the extraction as failed.
+        """
+        import pypdfium2 as pdfium
 
-            file.seek(0)
-            reader = PdfReader(io.BytesIO(file.read()))
-            text_parts = []
-            for page in reader.pages:
-                page_text = page.extract_text()
+        file.seek(0)
+        pdf = pdfium.PdfDocument(RecordService._pdf_source(file))
+        text_parts = []
+        total_length = 0
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range().strip()
+                textpage.close()
+                page.close()
                 if page_text:
-                    text_parts.append(page_text.strip())
-            file.seek(0)
-            return "\n\n".join(text_parts)[:50000]  # Cap at 50k chars
-        except Exception as e:
-            logger.warning("PDF extraction failed: %s", e)
-            return ""
+                    text_parts.append(page_text)
+                    total_length += len(page_text) + 2
+                if total_length >= 50000:
+                    break  # Remaining pages would be cut by the cap anyway
+        finally:
+            pdf.close()
+        file.seek(0)
+        return "\n\n".join(text_parts)[:50000]  # Cap at 50k chars
+
+    @staticmethod
+    def _pdf_source(file):
+        """
+        Return the stored file's local path, or a seekable handle on other
+        storage backends, so PDFium reads it without a copy into memory.
+        """
+        try:
+            return file.path  # FieldFile on local storage
+        except (AttributeError, NotImplementedError):
+            pass
+        return getattr(file, "file", file)  # In-memory upload or remote storage
 
     @staticmethod
     def get_user_documents(user):
         return MedicalDocument.objects.filter(
             user=user, is_deleted=False,
-        ).select_related("record").order_by("-created_at")
+        ).order_by("-created_at")
+
+    # ---------------------------------------------------------------
+    # Chunked (resumable) Upload
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    @transaction.atomic
+    def start_upload(
+        user,
+        filename: str,
+        total_size: int,
+        document_type: str = "OTHER",
+        record=None,
+    ) -> DocumentUpload:
+        if total_size > MAX_DOCUMENT_SIZE:
+            raise ValueError("File must be smaller than 20MB.")
+
+        # Lock the user's row so concurrent starts count open uploads one at
+        # a time and cannot both slip under the cap.
+        get_user_model().objects.select_for_update().only("pk").get(pk=user.pk)
+        RecordService.expire_stale_uploads(user=user)
+        open_uploads = DocumentUpload.objects.filter(
+            user=user, document__isnull=True, is_deleted=False,
+        ).count()
+        if open_uploads >= MAX_OPEN_UPLOADS:
+            raise ValueError(
+                f"Too many uploads in progress; finish or wait for one to expire "
+                f"(at most {MAX_OPEN_UPLOADS})."
+            )
+
+        return DocumentUpload.objects.create(
+            user=user,
+            record=record,
+            original_filename=filename,
+            document_type=document_type,
+            total_size=total_size,
+            created_by=user,
+        )
+
+    @staticmethod
+    def get_open_upload(upload_id: str, user):
+        return DocumentUpload.objects.filter(
+            id=upload_id, user=user, document__isnull=True, is_deleted=False,
+        ).first()
+
+    @staticmethod
+    @transaction.atomic
+    def append_upload_chunk(upload: DocumentUpload, start: int, content: bytes) -> int:
+        """
+        Store one chunk of an upload at byte offset ``start``.
+        Chunks may arrive in any order or be retried; re-sending a chunk
+        replaces it. Returns the number of distinct bytes received so far.
+        """
+        if len(content) > UPLOAD_CHUNK_SIZE:
+            raise ValueError(f"Chunks must be at most {UPLOAD_CHUNK_SIZE} bytes.")
+        end = start + len(content) - 1
+        if not content or start < 0 or end >= upload.total_size:
+            raise ValueError("Chunk falls outside the declared file size.")
+
+        # Touching updated_at (which also drives expiry) locks the upload row
+        # until the chunk is written, so finalize cannot assemble the file
+        # mid-chunk; no row means it was finalized or expired meanwhile.
+        touched = DocumentUpload.objects.filter(
+            pk=upload.pk, document__isnull=True, is_deleted=False,
+        ).update(updated_at=timezone.now())
+        if not touched:
+            raise ValueError("Upload not found.")
+
+        # Write to a private temporary file, then rename it into place: the
+        # rename is atomic, so readers only ever see complete chunks and a
+        # retry simply replaces the earlier copy.
+        chunk_dir = upload.chunk_dir
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=chunk_dir, prefix=".part-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, chunk_dir / f"{start:012d}-{end:012d}")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return sum(e - s + 1 for s, e in RecordService._merged_ranges(upload))
+
+    @staticmethod
+    @transaction.atomic
+    def finalize_upload(
+        upload_id: str,
+        user,
+        ip_address: str = None,
+        user_agent: str = "",
+    ) -> MedicalDocument:
+        """
+        Assemble the stored chunks into a MedicalDocument.
+        The chunks are streamed into a temporary file one by one, so the
+        whole document is never held in memory.
+        """
+        upload = (
+            DocumentUpload.objects.select_for_update()
+            .filter(id=upload_id, user=user, document__isnull=True, is_deleted=False)
+            .first()
+        )
+        if not upload:
+            raise ValueError("Upload not found.")
+
+        ranges = RecordService._merged_ranges(upload)
+        if ranges != [(0, upload.total_size - 1)]:
+            raise ValueError("Upload is incomplete.")
+
+        with tempfile.TemporaryFile() as tmp:
+            written = 0
+            for start, end, path in RecordService._chunk_paths(upload):
+                if end < written:
+                    continue  # Fully covered by an earlier, overlapping chunk
+                with open(path, "rb") as chunk:
+                    chunk.seek(written - start)
+                    shutil.copyfileobj(chunk, tmp)
+                written = end + 1
+            tmp.seek(0)
+
+            file = File(tmp, name=upload.original_filename)
+            file.size = upload.total_size
+            doc = RecordService.upload_document(
+                user=user,
+                file=file,
+                document_type=upload.document_type,
+                record=upload.record,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+
+        upload.document = doc
+        upload.save(update_fields=["document", "updated_at"])
+
+        chunk_dir = upload.chunk_dir
+        transaction.on_commit(lambda: shutil.rmtree(chunk_dir, ignore_errors=True))
+        return doc
+
+    @staticmethod
+    def expire_stale_uploads(user=None) -> int:
+        """
+        Delete open uploads (and their chunks) untouched for longer than
+        UPLOAD_EXPIRY, for one user or for everyone. Returns how many went.
+        """
+        stale = DocumentUpload.objects.filter(
+            document__isnull=True,
+            updated_at__lt=timezone.now() - UPLOAD_EXPIRY,
+        )
+        if user is not None:
+            stale = stale.filter(user=user)
+
+        uploads = list(stale.only("id"))
+        for upload in uploads:
+            shutil.rmtree(upload.chunk_dir, ignore_errors=True)
+        DocumentUpload.objects.filter(pk__in=[u.pk for u in uploads]).delete()
+        return len(uploads)
+
+    @staticmethod
+    def _chunk_paths(upload: DocumentUpload) -> list:
+        """
+        Return ``(start, end, path)`` for each stored chunk, ordered by
+        offset. Anything else in the directory (e.g. a chunk still being
+        written) is ignored.
+        """
+        try:
+            entries = list(os.scandir(upload.chunk_dir))
+        except FileNotFoundError:
+            return []
+        chunks = []
+        for entry in entries:
+            match = CHUNK_NAME_RE.match(entry.name)
+            if match:
+                chunks.append((int(match[1]), int(match[2]), entry.path))
+        return sorted(chunks)
+
+    @staticmethod
+    def _merged_ranges(upload: DocumentUpload) -> list:
+        """Collapse the stored chunks into contiguous ``(start, end)`` byte ranges."""
+        ranges = []
+        for start, end, _ in RecordService._chunk_paths(upload):
+            if ranges and start <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return ranges
 
     # ---------------------------------------------------------------
     # AI Context Assembly
@@ -204,47 +592,67 @@ class RecordService:
         Assemble a text summary of the patient's medical records
         for injection into the AI triage prompt.
         """
-        records = MedicalRecord.objects.filter(
-            user=user, is_deleted=False,
-        ).order_by("record_type", "-date_recorded")
-
-        if not records.exists():
-            return ""
+        records = (
+            MedicalRecord.objects.filter(user=user, is_deleted=False)
+            .only(
+                "record_type", "title", "status", "severity",
+                "date_recorded", "description", "data",
+            )
+            .order_by("record_type", "-date_recorded")
+        )
 
-        sections = []
+        buf = io.StringIO()
+        write = buf.write
         current_type = None
+        has_records = False
 
-        for r in records:
+        # Stream the rows so long histories are never held in memory, and
+        # stop once the output cap is reached: later rows would be cut anyway.
+        for r in records.iterator(chunk_size=500):
+            has_records = True
             if r.record_type != current_type:
                 current_type = r.record_type
-                sections.append(f"\n## {r.get_record_type_display()}")
+                label = _RECORD_TYPE_LABEL.get(r.record_type, r.record_type)
+                write(f"\n## {label}\n")
 
-            line = f"- {r.title}"
+            # Write the entry fragments straight into the buffer rather
+            # than growing an intermediate line string.
+            write(f"- {r.title}")
             if r.status:
-                line += f" (Status: {r.status})"
+                write(f" (Status: {r.status})")
             if r.severity:
-                line += f" [Severity: {r.severity}]"
+                write(f" [Severity: {r.severity}]")
             if r.date_recorded:
-                line += f" — {r.date_recorded}"
-            sections.append(line)
+                write(f" — {r.date_recorded}")
+            write("\n")
 
             if r.description:
-                sections.append(f"  Details: {r.description[:500]}")
+                write(f"  Details: {r.description[:500]}\n")
 
             if r.data:
                 for key, val in r.data.items():
-                    sections.append(f"  {key}: {val}")
+                    write(f"  {key}: {val}\n")
+
+            if buf.tell() >= MAX_CONTEXT_CHARS:
+                return buf.getvalue()[:MAX_CONTEXT_CHARS]
+
+        if not has_records:
+            return ""
 
         # Include extracted text from documents (truncated)
-        documents = MedicalDocument.objects.filter(
-            user=user, is_deleted=False,
-        ).exclude(extracted_text="")[:5]
+        documents = list(
+            MedicalDocument.objects.filter(
+                user=user, is_deleted=False, has_extracted_text=True,
+            )
+            .values_list("original_filename", "document_type", "extracted_text")[:5]
+        )
 
-        if documents.exists():
-            sections.append("\n## Uploaded Medical Documents")
-            for doc in documents:
-                sections.append(f"\n### {doc.original_filename} ({doc.get_document_type_display()})")
-                sections.append(doc.extracted_text[:2000])
+        if documents:
+            write("\n## Uploaded Medical Documents\n")
+            for filename, document_type, extracted_text in documents:
+                label = _DOC_TYPE_LABEL.get(document_type, document_type)
+                write(f"\n### {filename} ({label})\n")
+                write(extracted_text[:2000])
+                write("\n")
 
-        context = "\n".join(sections)
-        return context[:10000]  # Cap total context
+        return buf.getvalue()[:MAX_CONTEXT_CHARS]
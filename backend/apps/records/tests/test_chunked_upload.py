@@ -0,0 +1,166 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.records.models.medical_record import DocumentUpload
+from apps.records.services.record_service import (
+    MAX_OPEN_UPLOADS,
+    UPLOAD_CHUNK_SIZE,
+    RecordService,
+)
+from apps.users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = bytes(range(256)) * 4  # 1 KiB
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_TASK_WORKERS=0)
+class ChunkedUploadTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def start(self, total_size: int = len(CONTENT)) -> str:
+        response = self.client.post(
+            "/api/v1/records/documents/upload/init/",
+            {"filename": "scan.txt", "total_size": total_size},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["chunk_size"], UPLOAD_CHUNK_SIZE)
+        return response.json()["upload_id"]
+
+    def send(self, upload_id: str, start: int, end: int):
+        return self.client.generic(
+            "PATCH",
+            f"/api/v1/records/documents/upload/{upload_id}/",
+            CONTENT[start:end + 1],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{len(CONTENT)}",
+        )
+
+    def finalize(self, upload_id: str):
+        return self.client.post(
+            f"/api/v1/records/documents/upload/{upload_id}/finalize/",
+        )
+
+    def assert_document_matches(self, response):
+        self.assertEqual(response.status_code, 201)
+        upload = DocumentUpload.objects.select_related("document").get(
+            document_id=response.json()["id"],
+        )
+        with upload.document.file.open("rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_out_of_order_chunks(self):
+        upload_id = self.start()
+        for start, end in ((512, 1023), (0, 255), (256, 511)):
+            self.assertEqual(self.send(upload_id, start, end).status_code, 200)
+        self.assert_document_matches(self.finalize(upload_id))
+
+    def test_overlapping_chunks(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 599)
+        response = self.send(upload_id, 400, 1023)
+        self.assertEqual(response.json()["received_bytes"], len(CONTENT))
+        self.assert_document_matches(self.finalize(upload_id))
+
+    def test_duplicate_chunk_replaces_the_earlier_copy(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 511)
+        response = self.send(upload_id, 0, 511)
+        self.assertEqual(response.json()["received_bytes"], 512)
+        self.send(upload_id, 512, 1023)
+        self.assert_document_matches(self.finalize(upload_id))
+
+    def test_stray_files_in_the_chunk_directory_are_ignored(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 1023)
+        upload = DocumentUpload.objects.get(pk=upload_id)
+        (upload.chunk_dir / ".part-abandoned").write_bytes(b"junk")
+        (upload.chunk_dir / "000000000000-000000000049_JYMTsCv").write_bytes(b"junk")
+        self.assertEqual(self.send(upload_id, 0, 1023).status_code, 200)
+        self.assert_document_matches(self.finalize(upload_id))
+
+    def test_incomplete_upload_cannot_be_finalized(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 255)
+        self.send(upload_id, 512, 1023)
+        response = self.finalize(upload_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Upload is incomplete.")
+
+    def test_chunks_are_rejected_after_finalize(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 1023)
+        self.assertEqual(self.finalize(upload_id).status_code, 201)
+        self.assertEqual(self.send(upload_id, 0, 1023).status_code, 404)
+
+    def test_open_uploads_are_capped_per_user(self):
+        for _ in range(MAX_OPEN_UPLOADS):
+            self.start()
+        response = self.client.post(
+            "/api/v1/records/documents/upload/init/",
+            {"filename": "scan.txt", "total_size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_stale_uploads_expire(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, 255)
+        upload = DocumentUpload.objects.get(pk=upload_id)
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch(
+            "apps.records.services.record_service.timezone.now", return_value=later,
+        ):
+            self.assertEqual(RecordService.expire_stale_uploads(), 1)
+        self.assertFalse(DocumentUpload.objects.filter(pk=upload_id).exists())
+        self.assertFalse(upload.chunk_dir.exists())
+
+    def test_filename_is_reduced_to_its_base_name(self):
+        for filename, expected in (
+            ("../../etc/passwd", "passwd"),
+            ("C:\\Users\\me\\scan.pdf", "scan.pdf"),
+        ):
+            response = self.client.post(
+                "/api/v1/records/documents/upload/init/",
+                {"filename": filename, "total_size": 10},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+            upload = DocumentUpload.objects.get(pk=response.json()["upload_id"])
+            self.assertEqual(upload.original_filename, expected)
+
+    def test_filename_without_a_base_name_is_rejected(self):
+        response = self.client.post(
+            "/api/v1/records/documents/upload/init/",
+            {"filename": "scans/..", "total_size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_oversized_chunk_is_rejected_before_reading_the_body(self):
+        upload_id = self.start(total_size=UPLOAD_CHUNK_SIZE + 1)
+        response = self.client.generic(
+            "PATCH",
+            f"/api/v1/records/documents/upload/{upload_id}/",
+            b"x",
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=(
+                f"bytes 0-{UPLOAD_CHUNK_SIZE}/{UPLOAD_CHUNK_SIZE + 1}"
+            ),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("at most", response.json()["error"])
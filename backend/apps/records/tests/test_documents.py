@@ -0,0 +1,79 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+
+import pypdfium2 as pdfium
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.records.models.medical_record import MedicalDocument
+from apps.records.services.record_service import RecordService
+from apps.users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def blank_pdf() -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    pdf.new_page(200, 200)
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    pdf.close()
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_TASK_WORKERS=0)
+class DocumentExtractionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+
+    def upload(self, content: bytes) -> MedicalDocument:
+        with self.captureOnCommitCallbacks(execute=True):
+            doc = RecordService.upload_document(
+                user=self.user,
+                file=SimpleUploadedFile("report.pdf", content),
+            )
+        doc.refresh_from_db()
+        return doc
+
+    def test_readable_pdf_is_marked_done(self):
+        doc = self.upload(blank_pdf())
+        self.assertEqual(doc.extraction_status, MedicalDocument.ExtractionStatus.DONE)
+
+    def test_stored_pdf_is_parsed_from_its_path(self):
+        doc = self.upload(blank_pdf())
+        self.assertEqual(RecordService._pdf_source(doc.file), doc.file.path)
+
+    def test_corrupt_pdf_is_marked_failed(self):
+        doc = self.upload(b"%PDF-1.4 this is not really a pdf")
+        self.assertEqual(doc.extraction_status, MedicalDocument.ExtractionStatus.FAILED)
+        self.assertFalse(doc.has_extracted_text)
+
+    def test_lost_extraction_job_is_retried(self):
+        # Upload without running the on-commit job, as if the worker died.
+        doc = RecordService.upload_document(
+            user=self.user,
+            file=SimpleUploadedFile("report.pdf", blank_pdf()),
+        )
+        pending = MedicalDocument.ExtractionStatus.PENDING
+        self.assertEqual(doc.extraction_status, pending)
+
+        call_command("retry_extractions", stdout=io.StringIO())
+        doc.refresh_from_db()
+        # A recent upload may still have its job queued.
+        self.assertEqual(doc.extraction_status, pending)
+
+        MedicalDocument.objects.filter(pk=doc.pk).update(
+            created_at=timezone.now() - timedelta(minutes=11),
+        )
+        call_command("retry_extractions", stdout=io.StringIO())
+        doc.refresh_from_db()
+        self.assertEqual(doc.extraction_status, MedicalDocument.ExtractionStatus.DONE)
@@ -0,0 +1,109 @@
+import importlib
+from datetime import date
+
+from django.apps import apps
+from django.test import TestCase, override_settings
+
+from apps.records.models.medical_record import MedicalDocument, MedicalRecord
+from apps.records.services.record_service import MAX_CONTEXT_CHARS, RecordService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class MedicalContextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+
+    def add_record(self, **kwargs):
+        fields = {"record_type": "CONDITION", "title": "Asthma", **kwargs}
+        return RecordService.create_record(user=self.user, **fields)
+
+    def add_document(self, name: str, extracted_text: str = "", **kwargs):
+        return MedicalDocument.objects.create(
+            user=self.user,
+            file=f"records/documents/{name}",
+            original_filename=name,
+            extracted_text=extracted_text,
+            has_extracted_text=bool(extracted_text),
+            **kwargs,
+        )
+
+    def test_patient_without_records_gets_empty_context_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(RecordService.get_patient_medical_context(self.user), "")
+
+    def test_records_and_documents_are_read_once_each(self):
+        self.add_record()
+        self.add_record(title="Eczema")
+        with self.assertNumQueries(2):
+            context = RecordService.get_patient_medical_context(self.user)
+        self.assertIn("Asthma", context)
+        self.assertIn("Eczema", context)
+
+    def test_entry_layout(self):
+        self.add_record(
+            status="CHRONIC",
+            severity="MODERATE",
+            date_recorded=date(2024, 3, 1),
+            description="Worse in winter.",
+            data={"inhaler": "salbutamol"},
+        )
+        self.add_record(record_type="ALLERGY", title="Penicillin", status="")
+        self.assertEqual(
+            RecordService.get_patient_medical_context(self.user),
+            "\n## Allergy\n"
+            "- Penicillin\n"
+            "\n## Condition / Diagnosis\n"
+            "- Asthma (Status: CHRONIC) [Severity: MODERATE] — 2024-03-01\n"
+            "  Details: Worse in winter.\n"
+            "  inhaler: salbutamol\n",
+        )
+
+    def test_type_labels_with_raw_value_fallback(self):
+        record = self.add_record()
+        # A value no longer among the choices is shown as stored.
+        MedicalRecord.objects.filter(pk=record.pk).update(record_type="LEGACY")
+        self.add_document("cbc.pdf", "Haemoglobin 13.2", document_type="LAB_REPORT")
+
+        context = RecordService.get_patient_medical_context(self.user)
+        self.assertIn("\n## LEGACY\n", context)
+        self.assertIn("\n### cbc.pdf (Lab Report)\nHaemoglobin 13.2\n", context)
+
+    def test_assembly_stops_at_the_cap(self):
+        items = [
+            {"record_type": "CONDITION", "title": f"#{i}", "description": "x" * 500}
+            for i in range(40)
+        ]
+        RecordService.bulk_create_records(user=self.user, items=items)
+        self.add_document("cbc.pdf", "Haemoglobin 13.2")
+        # The records alone fill the cap, so documents are never queried.
+        with self.assertNumQueries(1):
+            context = RecordService.get_patient_medical_context(self.user)
+        self.assertEqual(len(context), MAX_CONTEXT_CHARS)
+        self.assertNotIn("cbc.pdf", context)
+
+    def test_only_live_documents_with_text_are_included(self):
+        self.add_record()
+        self.add_document("cbc.pdf", "Haemoglobin 13.2")
+        self.add_document("scan.pdf")
+        self.add_document("old.pdf", "Ferritin 40", is_deleted=True)
+
+        context = RecordService.get_patient_medical_context(self.user)
+        self.assertIn("cbc.pdf", context)
+        self.assertNotIn("scan.pdf", context)
+        self.assertNotIn("old.pdf", context)
+
+    def test_has_extracted_text_backfill(self):
+        migration = importlib.import_module(
+            "apps.records.migrations.0006_medicaldocument_has_extracted_text"
+        )
+        with_text = self.add_document("cbc.pdf", "Haemoglobin 13.2")
+        without_text = self.add_document("scan.pdf")
+        MedicalDocument.objects.update(has_extracted_text=False)
+
+        migration.backfill_has_extracted_text(apps, None)
+
+        with_text.refresh_from_db()
+        without_text.refresh_from_db()
+        self.assertTrue(with_text.has_extracted_text)
+        self.assertFalse(without_text.has_extracted_text)
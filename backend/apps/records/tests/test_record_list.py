@@ -0,0 +1,61 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.records.models.medical_record import MedicalDocument
+from apps.records.services.record_service import RecordService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class RecordListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_records(self, count: int):
+        for i in range(count):
+            record = RecordService.create_record(
+                user=self.user, record_type="LAB_RESULT", title=f"Panel {i}",
+            )
+            MedicalDocument.objects.create(
+                user=self.user,
+                record=record,
+                file=f"records/documents/panel-{i}.pdf",
+                original_filename=f"panel-{i}.pdf",
+            )
+
+    def list_records(self, url: str = "/api/v1/records/"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"], len(ctx.captured_queries)
+
+    def test_documents_are_loaded_in_one_query_for_the_page(self):
+        self.add_records(1)
+        _, queries = self.list_records()
+        self.add_records(5)
+        results, more_queries = self.list_records()
+        # Page count, the records, and their documents.
+        self.assertEqual(queries, 3)
+        self.assertEqual(more_queries, 3)
+        self.assertEqual(len(results), 6)
+        for row in results:
+            self.assertEqual(len(row["documents"]), 1)
+
+    def test_description_is_deferred_unless_requested(self):
+        RecordService.create_record(
+            user=self.user, record_type="ALLERGY", title="Penicillin",
+            description="Hives within an hour.",
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            results, _ = self.list_records()
+        self.assertEqual(results[0]["description"], "")
+        self.assertFalse(
+            any('."description"' in q["sql"] for q in ctx.captured_queries)
+        )
+
+        results, _ = self.list_records("/api/v1/records/?include_description=1")
+        self.assertEqual(results[0]["description"], "Hives within an hour.")
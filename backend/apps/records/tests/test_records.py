@@ -0,0 +1,131 @@
+import uuid
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.audit.models.audit_log import AuditLog
+from apps.records.api.serializers import MedicalRecordSerializer
+from apps.records.models.medical_record import MedicalDocument, MedicalRecord
+from apps.records.services.record_service import DOCUMENT_SUMMARY_FIELDS, RecordService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class RecordDetailTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.other = User.objects.create_user("other@example.com", "pw")
+        self.record = RecordService.create_record(
+            user=self.user, record_type="ALLERGY", title="Penicillin",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/records/{self.record.id}/"
+
+    def add_document(self, name: str, **kwargs) -> MedicalDocument:
+        return MedicalDocument.objects.create(
+            user=self.user,
+            record=self.record,
+            file=f"records/documents/{name}",
+            original_filename=name,
+            **kwargs,
+        )
+
+    def test_detail_renders_live_documents_as_summaries(self):
+        self.add_document("allergy-test.pdf")
+        self.add_document("old.pdf", is_deleted=True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        documents = response.json()["documents"]
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(set(documents[0]), set(DOCUMENT_SUMMARY_FIELDS))
+        self.assertEqual(documents[0]["original_filename"], "allergy-test.pdf")
+
+    def test_delete_then_the_record_is_gone(self):
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertTrue(MedicalRecord.objects.get(pk=self.record.id).is_deleted)
+        self.assertEqual(self.client.delete(self.url).status_code, 404)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_patch_returns_only_the_changed_fields(self):
+        response = self.client.patch(
+            self.url, {"status": "RESOLVED", "severity": "MILD"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()), {"id", "status", "severity", "updated_at"},
+        )
+        self.assertEqual(response.json()["status"], "RESOLVED")
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.severity, "MILD")
+
+    def test_field_subset_does_not_leak_into_the_cached_fields(self):
+        self.record._documents_cache = []
+        partial = MedicalRecordSerializer(self.record, fields=["id", "title"]).data
+        self.assertEqual(set(partial), {"id", "title"})
+        full = MedicalRecordSerializer(self.record).data
+        self.assertEqual(set(full), set(MedicalRecordSerializer.Meta.fields))
+
+    def test_patch_of_missing_record_is_404_before_validation(self):
+        response = self.client.patch(
+            f"/api/v1/records/{uuid.uuid4()}/", {"status": "BOGUS"}, format="json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_patch_of_another_users_record_is_404(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.patch(self.url, {"status": "BOGUS"}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+
+class ChoiceValidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_invalid_choices_are_rejected(self):
+        response = self.client.post(
+            "/api/v1/records/",
+            {"record_type": "HOROSCOPE", "title": "Taurus", "status": "MAYBE"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["record_type"], ['"HOROSCOPE" is not a valid choice.'],
+        )
+        self.assertIn("status", response.json())
+        self.assertFalse(MedicalRecord.objects.exists())
+
+    def test_valid_choices_and_blank_severity_are_accepted(self):
+        response = self.client.post(
+            "/api/v1/records/",
+            {"record_type": "ALLERGY", "title": "Penicillin", "severity": ""},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+class BulkCreateRecordsTests(TestCase):
+    def test_records_and_audit_entries_are_inserted_in_bulk(self):
+        user = User.objects.create_user("patient@example.com", "pw")
+        items = [
+            {"record_type": "MEDICATION", "title": f"Drug {i}"} for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            records = RecordService.bulk_create_records(user=user, items=items)
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(
+            sorted(r.title for r in MedicalRecord.objects.filter(user=user)),
+            ["Drug 0", "Drug 1", "Drug 2"],
+        )
+        self.assertEqual(
+            set(AuditLog.objects.filter(action="CREATE").values_list(
+                "resource_id", flat=True,
+            )),
+            {str(r.id) for r in records},
+        )
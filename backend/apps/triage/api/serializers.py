@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from apps.common.serializers import CachedFieldsMixin
 from apps.triage.models.triage_session import (
     ImageAnalysis,
     TriageResult,
@@ -7,7 +8,7 @@ from apps.triage.models.triage_session import (
 )
 
 
-class ImageAnalysisSerializer(serializers.ModelSerializer):
+class ImageAnalysisSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ImageAnalysis
         fields = [
@@ -22,7 +23,7 @@ class ImageAnalysisSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class TriageResultSerializer(serializers.ModelSerializer):
+class TriageResultSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TriageResult
         fields = [
@@ -38,7 +39,7 @@ class TriageResultSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class TriageSessionSerializer(serializers.ModelSerializer):
+class TriageSessionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     result = TriageResultSerializer(read_only=True)
     images = ImageAnalysisSerializer(many=True, read_only=True)
 
@@ -67,6 +68,31 @@ class TriageSessionSerializer(serializers.ModelSerializer):
         ]
 
 
+class TriageSessionListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Session list row: the result summary columns instead of the nested result."""
+
+    images = ImageAnalysisSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = TriageSession
+        fields = [
+            "id",
+            "source",
+            "status",
+            "symptoms_text",
+            "inference_mode",
+            "model_version",
+            "device_info",
+            "severity",
+            "confidence_score",
+            "diagnosis_summary",
+            "images",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class CreateSessionSerializer(serializers.Serializer):
     symptoms_text = serializers.CharField(required=False, allow_blank=True, default="")
     source = serializers.ChoiceField(
@@ -1,3 +1,6 @@
+from django.core.cache import cache
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -6,27 +9,68 @@ from rest_framework.parsers import MultiPartParser, FormParser
 
 from apps.common.permissions import IsPatient, IsClinician
 from apps.triage.models.triage_session import TriageSession
-from apps.triage.services.triage_service import TriageService
+from apps.triage.services.triage_service import (
+    MAX_IMAGES_PER_UPLOAD,
+    SERVER_INFERENCE_TIMEOUT,
+    TriageService,
+)
 from apps.triage.api.serializers import (
     CreateSessionSerializer,
     SaveResultSerializer,
     ServerInferenceSerializer,
+    TriageSessionListSerializer,
     TriageSessionSerializer,
 )
 
+SESSION_CACHE_TIMEOUT = 60 * 60  # seconds
+
+
+def _new_session_payload(session: TriageSession) -> dict:
+    """
+    TriageSessionSerializer output for a session that was just created,
+    built directly from the instance: it has no result or images yet.
+    """
+    return {
+        "id": str(session.id),
+        "source": session.source,
+        "status": session.status,
+        "symptoms_text": session.symptoms_text,
+        "inference_mode": session.inference_mode,
+        "model_version": session.model_version,
+        "device_info": session.device_info,
+        "result": None,
+        "images": [],
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+    }
+
 
 class TriageSessionListCreateView(generics.ListCreateAPIView):
     """
-    GET  — list the authenticated user's triage sessions.
+    GET  — list the authenticated user's triage sessions with a result
+           summary (?lite=1 for summary rows without images). The full
+           result is on the session detail endpoint.
     POST — create a new triage session.
     """
 
-    serializer_class = TriageSessionSerializer
+    serializer_class = TriageSessionListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return TriageService.get_user_sessions(self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("lite") not in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+
+        # Opt-in summary rows for dashboards that do not need the nested
+        # result and images: plain dicts, no per-field serializer work.
+        rows = TriageService.get_user_session_summaries(request.user)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+        return Response(list(rows))
+
     def create(self, request, *args, **kwargs):
         serializer = CreateSessionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -39,28 +83,72 @@ class TriageSessionListCreateView(generics.ListCreateAPIView):
             inference_mode=data["inference_mode"],
             model_version=data["model_version"],
             device_info=data["device_info"],
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
 
         return Response(
-            TriageSessionSerializer(session).data,
+            _new_session_payload(session),
             status=status.HTTP_201_CREATED,
         )
 
 
 class TriageSessionDetailView(generics.RetrieveAPIView):
-    """GET — retrieve a single triage session with results."""
+    """
+    GET — retrieve a single triage session with results.
+    COMPLETED sessions are served from the cache, keyed on updated_at so
+    any later write to the session yields a new key.
+
+    The raw model output lives in its own table and is left out unless
+    asked for with ``?include=raw``.
+    """
 
     serializer_class = TriageSessionSerializer
     permission_classes = [IsAuthenticated]
 
+    def include_raw(self) -> bool:
+        return "raw" in self.request.query_params.get("include", "").split(",")
+
     def get_object(self):
         return TriageService.get_session_detail(
             session_id=self.kwargs["session_id"],
             user=self.request.user,
         )
 
+    def retrieve(self, request, *args, **kwargs):
+        session_id = self.kwargs["session_id"]
+        state = TriageSession.objects.filter(
+            id=session_id, user=request.user, is_deleted=False,
+        ).values_list("status", "updated_at").first()
+        if not state:
+            return Response(
+                {"error": "Session not found."}, status=status.HTTP_404_NOT_FOUND,
+            )
+
+        session_status, updated_at = state
+        if (
+            session_status == TriageSession.Status.PENDING
+            and updated_at < timezone.now() - SERVER_INFERENCE_TIMEOUT
+        ):
+            TriageService.fail_if_stale(session_id, request.user)
+        if session_status != TriageSession.Status.COMPLETED:
+            data = self.get_serializer(self.get_object()).data
+        else:
+            cache_key = (
+                f"triage:session:{request.user.id}:{session_id}:"
+                f"{updated_at.timestamp()}"
+            )
+            data = cache.get(cache_key)
+            if data is None:
+                data = self.get_serializer(self.get_object()).data
+                cache.set(cache_key, data, SESSION_CACHE_TIMEOUT)
+
+        if self.include_raw() and data.get("result"):
+            # Added on the way out so the cached payload stays raw-free.
+            raw = TriageService.get_raw_model_output(data["result"]["id"])
+            data = {**data, "result": {**data["result"], "raw_model_output": raw}}
+        return Response(data)
+
 
 class TriageResultCreateView(APIView):
     """
@@ -75,10 +163,11 @@ class TriageResultCreateView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
+        # Only the columns save_result() and the XAI explanation read.
         session = TriageSession.objects.filter(
             id=data["session_id"],
             user=request.user,
-        ).first()
+        ).only("id", "user", "symptoms_text", "model_version").first()
 
         if not session:
             return Response(
@@ -96,9 +185,14 @@ class TriageResultCreateView(APIView):
             explainability=data["explainability"],
             raw_model_output=data["raw_model_output"],
             user=request.user,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
+        if result is None:
+            return Response(
+                {"error": "Session is no longer awaiting a result."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response(
             {"id": str(result.id), "status": "saved"},
@@ -109,7 +203,10 @@ class TriageResultCreateView(APIView):
 class TriageInferenceView(APIView):
     """
     POST — Server-side AI inference using Google Gemini (MedGemma).
-    Sends patient symptoms + medical history to AI and returns structured diagnosis.
+    Queues the inference and returns the PENDING session (202); poll
+    the session detail endpoint for the structured diagnosis.
+    The slow model call runs off the request thread, so the view itself
+    only performs a single INSERT and stays a regular synchronous view.
     """
 
     permission_classes = [IsAuthenticated]
@@ -119,97 +216,88 @@ class TriageInferenceView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
-        # Fetch patient medical context
-        from apps.records.services.record_service import RecordService
-        from apps.triage.services.gemini_service import GeminiService
-
-        medical_context = RecordService.get_patient_medical_context(request.user)
-
-        # Run AI inference via Gemini
-        ai_result = GeminiService.run_inference(
-            symptoms_text=data["symptoms_text"],
-            medical_context=medical_context or "",
-        )
-
-        # Create session
-        session = TriageService.create_session(
+        session = TriageService.start_server_inference(
             user=request.user,
             symptoms_text=data["symptoms_text"],
             source=data["source"],
-            inference_mode="SERVER",
-            model_version="gemini-2.0-flash",
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-        )
-
-        # Add medical context info to explainability
-        explainability = ai_result.get("explainability", {})
-        if medical_context:
-            factors = explainability.get("contributing_factors", [])
-            if "Patient medical history considered" not in factors:
-                factors.append("Patient medical history considered")
-            explainability["contributing_factors"] = factors
-            explainability["medical_context_available"] = True
-
-        # Save AI result
-        result = TriageService.save_result(
-            session=session,
-            diagnosis=ai_result["diagnosis"],
-            severity=ai_result["severity"],
-            confidence_score=ai_result["confidence_score"],
-            recommendations=ai_result["recommendations"],
-            differential_diagnoses=ai_result["differential_diagnoses"],
-            explainability=explainability,
-            raw_model_output=ai_result.get("raw_model_output", ""),
-            user=request.user,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
 
         return Response(
-            TriageSessionSerializer(
-                TriageService.get_session_detail(
-                    session_id=str(session.id),
-                    user=request.user,
-                )
-            ).data,
-            status=status.HTTP_201_CREATED,
+            _new_session_payload(session),
+            status=status.HTTP_202_ACCEPTED,
         )
 
 
 class ImageUploadView(APIView):
-    """POST — upload an image for vision analysis."""
+    """
+    POST — upload images for vision analysis. Send one file as ``image``,
+    or several at once as repeated ``images`` parts.
+    """
 
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        # Spool the upload to a temporary file instead of memory; local
+        # storage then moves that file into place rather than copying it.
+        request._request.upload_handlers = [
+            TemporaryFileUploadHandler(request._request),
+        ]
+
         session_id = request.data.get("session_id")
+        images = request.FILES.getlist("images")
         image = request.FILES.get("image")
 
-        if not session_id or not image:
+        if not session_id or not (images or image):
             return Response(
                 {"error": "session_id and image are required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        session = TriageSession.objects.filter(
-            id=session_id,
-            user=request.user,
-        ).first()
+        if len(images) > MAX_IMAGES_PER_UPLOAD:
+            return Response(
+                {
+                    "error": (
+                        f"At most {MAX_IMAGES_PER_UPLOAD} images can be "
+                        "uploaded at once."
+                    ),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        if not session:
+        try:
+            if images:
+                analyses = TriageService.save_image_analyses(
+                    session_id=session_id,
+                    user=request.user,
+                    images=images,
+                )
+                return Response(
+                    {
+                        "images": [
+                            {"id": str(a.id), "original_filename": a.original_filename}
+                            for a in analyses
+                        ],
+                        "status": "uploaded",
+                    },
+                    status=status.HTTP_201_CREATED,
+                )
+
+            analysis = TriageService.save_image_analysis(
+                session_id=session_id,
+                user=request.user,
+                image=image,
+                original_filename=image.name,
+            )
+        except TriageSession.DoesNotExist:
+            # Missing, deleted and foreign sessions all 404.
             return Response(
                 {"error": "Session not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        analysis = TriageService.save_image_analysis(
-            session=session,
-            image=image,
-            original_filename=image.name,
-        )
-
         return Response(
             {"id": str(analysis.id), "status": "uploaded"},
             status=status.HTTP_201_CREATED,
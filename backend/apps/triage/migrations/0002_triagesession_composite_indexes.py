@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('triage', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='triagesession',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='triage_user_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='triagesession',
+            index=models.Index(fields=['user', 'source', '-created_at'], name='triage_user_source_created'),
+        ),
+        migrations.AddIndex(
+            model_name='triagesession',
+            index=models.Index(fields=['inference_mode', '-created_at'], name='triage_mode_created'),
+        ),
+    ]
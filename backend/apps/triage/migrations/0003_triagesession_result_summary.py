@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:54
+
+from django.db import migrations, models
+
+
+def backfill_result_summary(apps, schema_editor):
+    TriageSession = apps.get_model("triage", "TriageSession")
+    TriageResult = apps.get_model("triage", "TriageResult")
+    sessions = [
+        TriageSession(
+            id=session_id,
+            severity=severity,
+            confidence_score=confidence_score,
+            diagnosis_summary=diagnosis[:255],
+        )
+        for session_id, severity, confidence_score, diagnosis in TriageResult.objects.values_list(
+            "session_id", "severity", "confidence_score", "diagnosis",
+        ).iterator()
+    ]
+    TriageSession.objects.bulk_update(
+        sessions,
+        ["severity", "confidence_score", "diagnosis_summary"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('triage', '0002_triagesession_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='triagesession',
+            name='confidence_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='triagesession',
+            name='diagnosis_summary',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='triagesession',
+            name='severity',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.RunPython(backfill_result_summary, migrations.RunPython.noop),
+    ]
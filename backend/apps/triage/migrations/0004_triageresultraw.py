@@ -0,0 +1,64 @@
+# Generated by Django 5.1.15 on 2026-10-15 11:55
+
+import json
+import uuid
+import zlib
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_raw_model_output(apps, schema_editor):
+    TriageResult = apps.get_model("triage", "TriageResult")
+    TriageResultRaw = apps.get_model("triage", "TriageResultRaw")
+    rows = TriageResult.objects.values_list(
+        "id", "created_by_id", "raw_model_output",
+    ).iterator()
+    TriageResultRaw.objects.bulk_create(
+        (
+            TriageResultRaw(
+                result_id=result_id,
+                created_by_id=created_by_id,
+                payload=zlib.compress(
+                    json.dumps(output, separators=(",", ":")).encode(),
+                ),
+            )
+            for result_id, created_by_id, output in rows
+            if output
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('triage', '0003_triagesession_result_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TriageResultRaw',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False)),
+                ('payload', models.BinaryField()),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='raw', to='triage.triageresult')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(move_raw_model_output, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='triageresult',
+            name='raw_model_output',
+        ),
+    ]
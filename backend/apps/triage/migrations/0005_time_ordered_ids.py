@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-15 12:00
+
+import apps.common.models.base
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('triage', '0004_triageresultraw'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imageanalysis',
+            name='id',
+            field=models.UUIDField(default=apps.common.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='triageresult',
+            name='id',
+            field=models.UUIDField(default=apps.common.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='triageresultraw',
+            name='id',
+            field=models.UUIDField(default=apps.common.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='triagesession',
+            name='id',
+            field=models.UUIDField(default=apps.common.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
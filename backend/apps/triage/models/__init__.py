@@ -1,5 +1,6 @@
 from apps.triage.models.triage_session import (
     ImageAnalysis,
     TriageResult,
+    TriageResultRaw,
     TriageSession,
 )
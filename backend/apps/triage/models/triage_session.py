@@ -1,9 +1,11 @@
+import json
 import uuid
+import zlib
 
 from django.conf import settings
 from django.db import models
 
-from apps.common.models.base import BaseModel
+from apps.common.models.base import BaseModel, uuid7
 
 
 class TriageSession(BaseModel):
@@ -23,6 +25,8 @@ class TriageSession(BaseModel):
         COMPLETED = "COMPLETED", "Completed"
         FAILED = "FAILED", "Failed"
 
+    # Time-ordered keys (see uuid7) keep inserts at the end of the pk index.
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -52,11 +56,28 @@ class TriageSession(BaseModel):
         help_text="Client device capabilities (WebGPU, RAM, etc.)",
     )
 
+    # Summary of the result, copied on save so session lists need no join.
+    severity = models.CharField(max_length=20, blank=True, default="")
+    confidence_score = models.FloatField(null=True, blank=True)
+    diagnosis_summary = models.CharField(max_length=255, blank=True, default="")
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "-created_at"]),
             models.Index(fields=["status"]),
+            models.Index(
+                fields=["user", "status", "-created_at"],
+                name="triage_user_status_created",
+            ),
+            models.Index(
+                fields=["user", "source", "-created_at"],
+                name="triage_user_source_created",
+            ),
+            models.Index(
+                fields=["inference_mode", "-created_at"],
+                name="triage_mode_created",
+            ),
         ]
 
     def __str__(self):
@@ -76,6 +97,7 @@ class TriageResult(BaseModel):
         HIGH = "HIGH", "High"
         CRITICAL = "CRITICAL", "Critical"
 
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.OneToOneField(
         TriageSession,
         on_delete=models.CASCADE,
@@ -103,11 +125,6 @@ class TriageResult(BaseModel):
         default=dict,
         help_text="XAI data: contributing factors, feature importance.",
     )
-    raw_model_output = models.JSONField(
-        default=dict,
-        blank=True,
-        help_text="Raw model response for debugging.",
-    )
 
     class Meta:
         ordering = ["-created_at"]
@@ -116,12 +133,39 @@ class TriageResult(BaseModel):
         return f"Result for {self.session_id} — {self.severity}"
 
 
+class TriageResultRaw(BaseModel):
+    """
+    Raw model response for a triage result, kept out of the result row
+    so result queries never pull it. Stored as zlib-compressed JSON and
+    only read for debugging.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    result = models.OneToOneField(
+        TriageResult,
+        on_delete=models.CASCADE,
+        related_name="raw",
+    )
+    payload = models.BinaryField()
+
+    def __str__(self):
+        return f"Raw output for result {self.result_id}"
+
+    @staticmethod
+    def pack(output) -> bytes:
+        return zlib.compress(json.dumps(output, separators=(",", ":")).encode())
+
+    def unpack(self):
+        return json.loads(zlib.decompress(self.payload))
+
+
 class ImageAnalysis(BaseModel):
     """
     Image uploaded for visual diagnostic analysis.
     Stores the image, classification result, and vision model metadata.
     """
 
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(
         TriageSession,
         on_delete=models.CASCADE,
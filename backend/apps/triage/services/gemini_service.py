@@ -7,6 +7,7 @@ Returns structured diagnosis, severity, recommendations, and explainability.
 
 import json
 import logging
+import threading
 
 from decouple import config
 from google import genai
@@ -14,6 +15,25 @@ from google import genai
 logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = config("GEMINI_API_KEY", default="")
+# Per-request HTTP timeout, kept below the triage SERVER_INFERENCE_TIMEOUT
+# (75 s) so a hung call cannot hold an inference worker indefinitely.
+GEMINI_TIMEOUT_MS = 60_000
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> genai.Client:
+    """One client per process, so inference calls reuse its connections."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = genai.Client(
+                    api_key=GEMINI_API_KEY,
+                    http_options={"timeout": GEMINI_TIMEOUT_MS},
+                )
+    return _client
 
 MEDICAL_SYSTEM_PROMPT = """You are MedGemma, a clinical-grade AI triage assistant. Analyze the patient's symptoms and provide a structured medical assessment.
 
@@ -36,6 +56,22 @@ Respond ONLY with valid JSON in this exact format (no markdown, no code fences,
   }
 }"""
 
+# Static parts of the fallback responses, shared across calls. Tuples so
+# nothing downstream can mutate them in place.
+FALLBACK_RECOMMENDATIONS = (
+    "Schedule an appointment with your primary care physician",
+    "Monitor symptoms and note any changes",
+    "Stay hydrated and get adequate rest",
+    "Seek emergency care if symptoms worsen significantly",
+)
+FALLBACK_CONTRIBUTING_FACTORS = ("AI service fallback mode",)
+FALLBACK_REASONING = (
+    "The AI inference service is temporarily unavailable. "
+    "This is a general recommendation. Please set GEMINI_API_KEY "
+    "in your environment variables for AI-powered diagnosis."
+)
+PARSE_ERROR_RECOMMENDATIONS = ("Consult a healthcare professional for evaluation",)
+
 
 class GeminiService:
     """Calls Google Gemini API for medical triage inference."""
@@ -55,7 +91,7 @@ class GeminiService:
             return GeminiService._fallback_response(symptoms_text)
 
         try:
-            client = genai.Client(api_key=api_key)
+            client = _get_client()
 
             # Build user prompt
             user_prompt = f"Patient symptoms: {symptoms_text}"
@@ -122,10 +158,8 @@ class GeminiService:
                 "diagnosis": raw[:500] if raw else "AI analysis completed.",
                 "severity": "MEDIUM",
                 "confidence_score": 0.5,
-                "recommendations": [
-                    "Consult a healthcare professional for evaluation"
-                ],
-                "differential_diagnoses": [],
+                "recommendations": PARSE_ERROR_RECOMMENDATIONS,
+                "differential_diagnoses": (),
                 "explainability": {
                     "raw_response": raw[:1000],
                     "parse_error": str(e),
@@ -145,20 +179,11 @@ class GeminiService:
             ),
             "severity": "MEDIUM",
             "confidence_score": 0.3,
-            "recommendations": [
-                "Schedule an appointment with your primary care physician",
-                "Monitor symptoms and note any changes",
-                "Stay hydrated and get adequate rest",
-                "Seek emergency care if symptoms worsen significantly",
-            ],
-            "differential_diagnoses": [],
+            "recommendations": FALLBACK_RECOMMENDATIONS,
+            "differential_diagnoses": (),
             "explainability": {
-                "contributing_factors": ["AI service fallback mode"],
-                "reasoning": (
-                    "The AI inference service is temporarily unavailable. "
-                    "This is a general recommendation. Please set GEMINI_API_KEY "
-                    "in your environment variables for AI-powered diagnosis."
-                ),
+                "contributing_factors": FALLBACK_CONTRIBUTING_FACTORS,
+                "reasoning": FALLBACK_REASONING,
             },
             "raw_model_output": "",
         }
@@ -1,13 +1,57 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 
 from apps.audit.services.audit_service import AuditService
+from apps.common.background import run_in_queue
 from apps.triage.models.triage_session import (
     ImageAnalysis,
     TriageResult,
+    TriageResultRaw,
     TriageSession,
 )
 from apps.xai.services.xai_service import XAIService
 
+logger = logging.getLogger(__name__)
+
+SERVER_MODEL_VERSION = "gemini-2.0-flash"
+# Pending server sessions older than this are failed when polled; kept
+# under the frontend's 90 s poll deadline.
+SERVER_INFERENCE_TIMEOUT = timedelta(seconds=75)
+# Sessions in these states can still be completed or failed.
+AWAITING_RESULT_STATUSES = (
+    TriageSession.Status.PENDING,
+    TriageSession.Status.PROCESSING,
+)
+
+MAX_IMAGES_PER_UPLOAD = 10
+IMAGE_STORE_WORKERS = 4
+
+# Columns read by TriageSessionSerializer and its nested serializers.
+SESSION_FIELDS = (
+    "id", "source", "status", "symptoms_text", "inference_mode",
+    "model_version", "device_info", "created_at", "updated_at",
+)
+# Columns of the ?lite=1 session list (no nested result or images).
+SESSION_SUMMARY_FIELDS = (
+    "id", "source", "status", "inference_mode",
+    "severity", "confidence_score", "created_at",
+)
+# Denormalized result summary read by TriageSessionListSerializer.
+SESSION_RESULT_SUMMARY_FIELDS = ("severity", "confidence_score", "diagnosis_summary")
+RESULT_FIELDS = (
+    "id", "diagnosis", "severity", "confidence_score", "recommendations",
+    "differential_diagnoses", "explainability", "created_at",
+)
+IMAGE_FIELDS = (
+    "id", "session_id", "classification", "classification_confidence",
+    "vision_model_version", "analysis_metadata", "original_filename", "created_at",
+)
+
 
 class TriageService:
     """
@@ -16,6 +60,7 @@ class TriageService:
     """
 
     @staticmethod
+    @transaction.atomic
     def create_session(
         user,
         symptoms_text: str = "",
@@ -23,6 +68,7 @@ class TriageService:
         inference_mode: str = "CLIENT",
         model_version: str = "",
         device_info: dict = None,
+        status: str = TriageSession.Status.PROCESSING,
         ip_address: str = None,
         user_agent: str = "",
     ) -> TriageSession:
@@ -31,7 +77,7 @@ class TriageService:
             user=user,
             symptoms_text=symptoms_text,
             source=source,
-            status=TriageSession.Status.PROCESSING,
+            status=status,
             inference_mode=inference_mode,
             model_version=model_version,
             device_info=device_info or {},
@@ -64,12 +110,34 @@ class TriageService:
         user=None,
         ip_address: str = None,
         user_agent: str = "",
-    ) -> TriageResult:
+    ) -> TriageResult | None:
         """
         Persist an AI inference result (from client-side or server-side).
         Updates the session status to COMPLETED.
         Auto-generates an XAI explanation after saving.
+
+        Returns None, writing nothing, if the session is no longer awaiting
+        a result: already completed, or failed (e.g. a server inference
+        that outlived SERVER_INFERENCE_TIMEOUT).
         """
+        # Complete the session and copy the result summary onto it, but
+        # only while it is still PENDING or PROCESSING.
+        summary = {
+            "status": TriageSession.Status.COMPLETED,
+            "severity": severity,
+            "confidence_score": confidence_score,
+            "diagnosis_summary": diagnosis[:255],
+            "updated_at": timezone.now(),
+        }
+        completed = TriageSession.objects.filter(
+            pk=session.pk,
+            status__in=AWAITING_RESULT_STATUSES,
+        ).update(**summary)
+        if not completed:
+            return None
+        for field, value in summary.items():
+            setattr(session, field, value)
+
         result = TriageResult.objects.create(
             session=session,
             diagnosis=diagnosis,
@@ -78,12 +146,14 @@ class TriageService:
             recommendations=recommendations or [],
             differential_diagnoses=differential_diagnoses or [],
             explainability=explainability or {},
-            raw_model_output=raw_model_output or {},
             created_by=user or session.user,
         )
-
-        session.status = TriageSession.Status.COMPLETED
-        session.save(update_fields=["status", "updated_at"])
+        if raw_model_output:
+            TriageResultRaw.objects.create(
+                result=result,
+                payload=TriageResultRaw.pack(raw_model_output),
+                created_by=user or session.user,
+            )
 
         AuditService.log_action(
             user_id=str(session.user_id),
@@ -106,8 +176,111 @@ class TriageService:
         return result
 
     @staticmethod
+    def start_server_inference(
+        user,
+        symptoms_text: str = "",
+        source: str = "TEXT",
+        ip_address: str = None,
+        user_agent: str = "",
+    ) -> TriageSession:
+        """
+        Create a PENDING server-side session and queue the inference.
+        Clients poll the session until it is COMPLETED or FAILED.
+        """
+        session = TriageService.create_session(
+            user=user,
+            symptoms_text=symptoms_text,
+            source=source,
+            inference_mode="SERVER",
+            model_version=SERVER_MODEL_VERSION,
+            status=TriageSession.Status.PENDING,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        run_in_queue(
+            "inference",
+            TriageService.run_server_inference,
+            session.id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+        return session
+
+    @staticmethod
+    def run_server_inference(
+        session_id, ip_address: str = None, user_agent: str = "",
+    ) -> None:
+        """Run Gemini inference for a queued session and store the result."""
+        from apps.records.services.record_service import RecordService
+        from apps.triage.services.gemini_service import GeminiService
+
+        session = (
+            TriageSession.objects.select_related("user").filter(pk=session_id).first()
+        )
+        if not session or session.status != TriageSession.Status.PENDING:
+            return  # Gone, or already timed out while queued
+
+        try:
+            medical_context = RecordService.get_patient_medical_context(session.user)
+
+            ai_result = GeminiService.run_inference(
+                symptoms_text=session.symptoms_text,
+                medical_context=medical_context or "",
+            )
+
+            # Add medical context info to explainability. Build new objects
+            # rather than mutating: fallback responses share module constants.
+            explainability = ai_result.get("explainability", {})
+            if medical_context:
+                factors = list(explainability.get("contributing_factors", []))
+                if "Patient medical history considered" not in factors:
+                    factors.append("Patient medical history considered")
+                explainability = {
+                    **explainability,
+                    "contributing_factors": factors,
+                    "medical_context_available": True,
+                }
+
+            result = TriageService.save_result(
+                session=session,
+                diagnosis=ai_result["diagnosis"],
+                severity=ai_result["severity"],
+                confidence_score=ai_result["confidence_score"],
+                recommendations=ai_result["recommendations"],
+                differential_diagnoses=ai_result["differential_diagnoses"],
+                explainability=explainability,
+                raw_model_output=ai_result.get("raw_model_output", ""),
+                user=session.user,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            if result is None:
+                logger.warning(
+                    "Discarded late inference result for session %s", session_id,
+                )
+        except Exception as e:
+            logger.exception("Server inference failed for session %s", session_id)
+            TriageService.mark_failed(session, error_info=str(e))
+
+    @staticmethod
+    def _touch_session(session_id, user) -> None:
+        """
+        Bump the user's session's updated_at so cached detail responses
+        expire. The UPDATE doubles as the ownership check and holds the row
+        against a concurrent delete until commit. Raises
+        TriageSession.DoesNotExist if no live session of the user matches.
+        """
+        touched = TriageSession.objects.filter(
+            pk=session_id, user=user, is_deleted=False,
+        ).update(updated_at=timezone.now())
+        if not touched:
+            raise TriageSession.DoesNotExist
+
+    @staticmethod
+    @transaction.atomic
     def save_image_analysis(
-        session: TriageSession,
+        session_id,
+        user,
         image,
         original_filename: str = "",
         classification: str = "",
@@ -115,45 +288,144 @@ class TriageService:
         vision_model_version: str = "",
         analysis_metadata: dict = None,
     ) -> ImageAnalysis:
-        """Persist image analysis result."""
+        """
+        Persist image analysis result. Takes the session id so the session
+        row is not loaded; raises TriageSession.DoesNotExist unless it is a
+        live session of ``user``.
+        """
+        TriageService._touch_session(session_id, user)
         return ImageAnalysis.objects.create(
-            session=session,
+            session_id=session_id,
             image=image,
             original_filename=original_filename,
             classification=classification,
             classification_confidence=classification_confidence,
             vision_model_version=vision_model_version,
             analysis_metadata=analysis_metadata or {},
-            created_by=session.user,
+            created_by=user,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def save_image_analyses(session_id, user, images: list) -> list:
+        """
+        Persist several uploaded images for one session. The files are
+        written to storage in parallel, then all rows go in with a single
+        INSERT. Ownership is checked as in save_image_analysis().
+        """
+        TriageService._touch_session(session_id, user)
+        analyses = [
+            ImageAnalysis(
+                session_id=session_id,
+                original_filename=image.name,
+                analysis_metadata={},
+                created_by=user,
+            )
+            for image in images
+        ]
+
+        def store(pair):
+            analysis, image = pair
+            # save=False only writes the file; the row is inserted below.
+            analysis.image.save(image.name, image, save=False)
+
+        workers = min(IMAGE_STORE_WORKERS, len(images)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(store, zip(analyses, images)))
+
+        return ImageAnalysis.objects.bulk_create(analyses)
+
+    @staticmethod
+    def _with_results(queryset):
+        """
+        Eager-load each session's result and images, reading only the
+        columns the session serializer renders.
+        """
+        return (
+            queryset.select_related("result")
+            .prefetch_related(
+                Prefetch("images", queryset=ImageAnalysis.objects.only(*IMAGE_FIELDS))
+            )
+            .only(*SESSION_FIELDS, *(f"result__{f}" for f in RESULT_FIELDS))
         )
 
     @staticmethod
     def get_user_sessions(user, limit: int = 20):
-        """Retrieve a user's triage sessions with results."""
+        """
+        Retrieve a user's triage sessions with their images. The result
+        summary is read from the session's own columns, so no join.
+        """
         return (
             TriageSession.objects.filter(user=user, is_deleted=False)
-            .select_related("result")
-            .prefetch_related("images")
+            .prefetch_related(
+                Prefetch("images", queryset=ImageAnalysis.objects.only(*IMAGE_FIELDS))
+            )
+            .only(*SESSION_FIELDS, *SESSION_RESULT_SUMMARY_FIELDS)
             .order_by("-created_at")[:limit]
         )
 
+    @staticmethod
+    def get_user_session_summaries(user, limit: int = 20):
+        """The user's recent sessions as plain dicts of SESSION_SUMMARY_FIELDS."""
+        return TriageSession.objects.filter(
+            user=user, is_deleted=False,
+        ).order_by("-created_at").values(*SESSION_SUMMARY_FIELDS)[:limit]
+
     @staticmethod
     def get_session_detail(session_id: str, user):
         """Retrieve a single session with full results and images."""
-        return (
+        return TriageService._with_results(
             TriageSession.objects.filter(
                 id=session_id, user=user, is_deleted=False
             )
-            .select_related("result")
-            .prefetch_related("images")
-            .first()
+        ).first()
+
+    @staticmethod
+    def get_raw_model_output(result_id):
+        """Decompressed raw model output for a result, or None if none was stored."""
+        raw = TriageResultRaw.objects.filter(
+            result_id=result_id,
+        ).only("payload").first()
+        return raw.unpack() if raw else None
+
+    @staticmethod
+    def fail_if_stale(session_id, user) -> bool:
+        """
+        Mark a server session FAILED if it has been PENDING for longer than
+        SERVER_INFERENCE_TIMEOUT, e.g. because its job was lost with the
+        worker that held it. Returns whether the session was failed.
+        """
+        now = timezone.now()
+        failed = TriageSession.objects.filter(
+            pk=session_id,
+            user=user,
+            status=TriageSession.Status.PENDING,
+            updated_at__lt=now - SERVER_INFERENCE_TIMEOUT,
+        ).update(status=TriageSession.Status.FAILED, updated_at=now)
+        if not failed:
+            return False
+
+        AuditService.log_action(
+            user_id=str(user.id),
+            action="TRIAGE_SESSION_FAILED",
+            resource_type="TriageSession",
+            resource_id=str(session_id),
+            changes={"error": "Server inference timed out."},
         )
+        return True
 
     @staticmethod
     def mark_failed(session: TriageSession, error_info: str = ""):
-        """Mark a session as failed."""
+        """Mark a session as failed, unless it already completed or failed."""
+        now = timezone.now()
+        failed = TriageSession.objects.filter(
+            pk=session.pk,
+            status__in=AWAITING_RESULT_STATUSES,
+        ).update(status=TriageSession.Status.FAILED, updated_at=now)
+        if not failed:
+            return
         session.status = TriageSession.Status.FAILED
-        session.save(update_fields=["status", "updated_at"])
+        session.updated_at = now
 
         AuditService.log_action(
             user_id=str(session.user_id),
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.audit.models.audit_log import AuditLog
+from apps.triage.models.triage_session import TriageSession
+from apps.triage.services.triage_service import TriageService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class CreateSessionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_writes_session_and_audit_entry_without_a_refetch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/v1/triage/sessions/",
+                {"symptoms_text": "headache", "source": "TEXT"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+        statements = [q["sql"].split()[0].upper() for q in ctx.captured_queries]
+        self.assertEqual(statements.count("INSERT"), 2)
+        # The response is rendered from the instance create_session returned.
+        table = TriageSession._meta.db_table
+        self.assertFalse(
+            any(
+                q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+                for q in ctx.captured_queries
+            )
+        )
+        self.assertTrue(
+            AuditLog.objects.filter(
+                action="TRIAGE_SESSION_CREATED", resource_id=response.json()["id"],
+            ).exists()
+        )
+
+    def test_session_rolls_back_when_the_audit_write_fails(self):
+        with mock.patch.object(
+            AuditLog.objects, "create", side_effect=RuntimeError("audit down"),
+        ):
+            with self.assertRaises(RuntimeError):
+                TriageService.create_session(user=self.user, symptoms_text="headache")
+        self.assertFalse(TriageSession.objects.exists())
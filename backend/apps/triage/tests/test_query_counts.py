@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.triage.models.triage_session import TriageSession
+from apps.triage.services.triage_service import TriageService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class SessionQueryCountTests(TestCase):
+    """The session list and detail must not issue a query per row or relation."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_sessions(self, count: int):
+        sessions = []
+        for i in range(count):
+            session = TriageService.create_session(
+                user=self.user, symptoms_text=f"headache {i}",
+            )
+            TriageService.save_result(
+                session=session,
+                diagnosis="Tension headache",
+                severity="LOW",
+                confidence_score=0.6,
+                recommendations=["Rest"],
+                user=self.user,
+            )
+            sessions.append(session)
+        return sessions
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_sessions(self):
+        self.add_sessions(1)
+        self.assertEqual(self.count_queries("/api/v1/triage/sessions/"), 3)
+        self.add_sessions(5)
+        self.assertEqual(self.count_queries("/api/v1/triage/sessions/"), 3)
+
+    def test_detail_query_count(self):
+        session = self.add_sessions(1)[0]
+        url = f"/api/v1/triage/sessions/{session.id}/"
+        self.assertEqual(self.count_queries(url), 3)
+        # Completed sessions are then served from the cache.
+        self.assertEqual(self.count_queries(url), 1)
+
+    def test_cached_detail_is_refreshed_after_a_write(self):
+        session = self.add_sessions(1)[0]
+        url = f"/api/v1/triage/sessions/{session.id}/"
+        self.client.get(url)
+        # Any write to the session bumps updated_at, which is part of the key.
+        TriageSession.objects.filter(pk=session.id).update(updated_at=timezone.now())
+        self.assertEqual(self.count_queries(url), 3)
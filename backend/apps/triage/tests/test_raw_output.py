@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.triage.models.triage_session import TriageResult, TriageResultRaw
+from apps.triage.services.triage_service import TriageService
+from apps.users.models import User
+
+RAW_OUTPUT = {"candidates": [{"text": "Tension headache", "score": 0.61}]}
+
+
+class RawOutputTests(TestCase):
+    def test_pack_round_trips_and_compresses(self):
+        output = {"tokens": ["headache"] * 200}
+        payload = TriageResultRaw.pack(output)
+        self.assertLess(len(payload), len(str(output)) // 10)
+        self.assertEqual(TriageResultRaw(payload=payload).unpack(), output)
+
+    def test_raw_output_is_stored_beside_the_result(self):
+        user = User.objects.create_user("patient@example.com", "pw")
+        session = TriageService.create_session(user=user)
+        result = TriageService.save_result(
+            session=session,
+            diagnosis="Tension headache",
+            severity="LOW",
+            confidence_score=0.6,
+            raw_model_output=RAW_OUTPUT,
+        )
+        raw = TriageResultRaw.objects.get(result=result)
+        self.assertEqual(raw.unpack(), RAW_OUTPUT)
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class IncludeRawTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def completed_session(self, raw_model_output=None):
+        session = TriageService.create_session(user=self.user)
+        TriageService.save_result(
+            session=session,
+            diagnosis="Tension headache",
+            severity="LOW",
+            confidence_score=0.6,
+            raw_model_output=raw_model_output,
+        )
+        return f"/api/v1/triage/sessions/{session.id}/"
+
+    def result(self, url: str) -> dict:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["result"]
+
+    def test_raw_output_is_only_returned_on_request(self):
+        url = self.completed_session(RAW_OUTPUT)
+        self.assertNotIn("raw_model_output", self.result(url))
+        self.assertEqual(
+            self.result(f"{url}?include=raw")["raw_model_output"], RAW_OUTPUT,
+        )
+        # The cached response must not have picked up the raw output.
+        self.assertNotIn("raw_model_output", self.result(url))
+
+    def test_result_without_raw_output(self):
+        url = self.completed_session()
+        self.assertIsNone(self.result(f"{url}?include=raw")["raw_model_output"])
+
+
+class MoveRawOutputMigrationTests(TransactionTestCase):
+    before = [("triage", "0003_triagesession_result_summary")]
+    after = [("triage", "0004_triageresultraw")]
+
+    def tearDown(self):
+        # Leave the schema fully migrated for the tests that follow.
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_raw_output_is_moved_into_the_side_table(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        old_apps = executor.loader.project_state(self.before).apps
+        User = old_apps.get_model("users", "User")
+        Session = old_apps.get_model("triage", "TriageSession")
+        Result = old_apps.get_model("triage", "TriageResult")
+        user = User.objects.create(email="p@example.com")
+        moved, _ = (
+            Result.objects.create(
+                session=Session.objects.create(user=user),
+                diagnosis="Migraine",
+                severity="LOW",
+                confidence_score=0.6,
+                raw_model_output=output,
+            )
+            for output in (RAW_OUTPUT, {})
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+
+        new_apps = executor.loader.project_state(self.after).apps
+        rows = new_apps.get_model("triage", "TriageResultRaw").objects.all()
+        self.assertEqual([row.result_id for row in rows], [moved.id])
+        self.assertEqual(
+            TriageResultRaw(payload=bytes(rows[0].payload)).unpack(), RAW_OUTPUT,
+        )
+        self.assertEqual(TriageResult.objects.count(), 2)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.audit.models.audit_log import AuditLog
+from apps.triage.models.triage_session import TriageResult, TriageSession
+from apps.triage.services.triage_service import SERVER_INFERENCE_TIMEOUT, TriageService
+from apps.users.models import User
+from apps.xai.models.explanation import Explanation
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0, BACKGROUND_TASK_QUEUES={"inference": 0})
+@mock.patch("apps.triage.services.gemini_service.GEMINI_API_KEY", "")
+class ServerInferenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def poll(self, session_id) -> dict:
+        response = self.client.get(f"/api/v1/triage/sessions/{session_id}/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_inference_completes_in_the_background(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/v1/triage/inference/",
+                {"symptoms_text": "chest pain"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], "PENDING")
+        self.assertEqual(self.poll(response.json()["id"])["status"], "COMPLETED")
+
+    def test_stale_pending_session_is_failed_when_polled(self):
+        session = TriageService.create_session(
+            user=self.user,
+            inference_mode="SERVER",
+            status=TriageSession.Status.PENDING,
+        )
+        self.assertEqual(self.poll(session.id)["status"], "PENDING")
+
+        TriageSession.objects.filter(pk=session.id).update(
+            updated_at=timezone.now() - SERVER_INFERENCE_TIMEOUT - timedelta(seconds=1),
+        )
+        self.assertEqual(self.poll(session.id)["status"], "FAILED")
+
+    def test_late_result_for_a_timed_out_session_is_discarded(self):
+        session = TriageService.create_session(
+            user=self.user,
+            inference_mode="SERVER",
+            status=TriageSession.Status.PENDING,
+        )
+        stale = timezone.now() - SERVER_INFERENCE_TIMEOUT - timedelta(seconds=1)
+        TriageSession.objects.filter(pk=session.id).update(updated_at=stale)
+        self.assertEqual(self.poll(session.id)["status"], "FAILED")
+        audit_entries = AuditLog.objects.filter(resource_id=str(session.id)).count()
+
+        # The Gemini call returns only now, after the client was told it failed.
+        result = TriageService.save_result(
+            session=session, diagnosis="Late", severity="LOW", confidence_score=0.5,
+        )
+
+        self.assertIsNone(result)
+        session.refresh_from_db()
+        self.assertEqual(session.status, TriageSession.Status.FAILED)
+        self.assertFalse(TriageResult.objects.filter(session=session).exists())
+        self.assertEqual(
+            AuditLog.objects.filter(resource_id=str(session.id)).count(), audit_entries,
+        )
+        self.assertFalse(Explanation.objects.exists())
+
+    def test_job_for_a_timed_out_session_does_nothing(self):
+        session = TriageService.create_session(
+            user=self.user, inference_mode="SERVER", status=TriageSession.Status.FAILED,
+        )
+        TriageService.run_server_inference(session.id)
+        session.refresh_from_db()
+        self.assertEqual(session.status, TriageSession.Status.FAILED)
+        self.assertFalse(hasattr(session, "result"))
@@ -0,0 +1,75 @@
+import importlib
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.triage.models.triage_session import TriageResult, TriageSession
+from apps.triage.services.triage_service import SESSION_SUMMARY_FIELDS, TriageService
+from apps.users.models import User
+
+
+@override_settings(BACKGROUND_TASK_WORKERS=0)
+class SessionListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_session(self, diagnosis: str = "Tension headache"):
+        session = TriageService.create_session(user=self.user, symptoms_text="headache")
+        TriageService.save_result(
+            session=session,
+            diagnosis=diagnosis,
+            severity="LOW",
+            confidence_score=0.6,
+            user=self.user,
+        )
+        return session
+
+    def test_lite_list_returns_summary_rows(self):
+        for _ in range(3):
+            self.add_session()
+        # The page count and the rows, however many sessions there are.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/triage/sessions/?lite=1")
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()["results"]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), set(SESSION_SUMMARY_FIELDS))
+        self.assertEqual(rows[0]["severity"], "LOW")
+
+    def test_list_reads_the_result_summary_from_the_session(self):
+        self.add_session(diagnosis="D" * 300)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/v1/triage/sessions/")
+        row = response.json()["results"][0]
+        self.assertEqual(row["severity"], "LOW")
+        self.assertEqual(row["confidence_score"], 0.6)
+        self.assertEqual(row["diagnosis_summary"], "D" * 255)
+        self.assertNotIn("result", row)
+        result_table = TriageResult._meta.db_table
+        self.assertFalse(
+            any(f'"{result_table}"' in q["sql"] for q in ctx.captured_queries)
+        )
+
+    def test_result_summary_backfill(self):
+        migration = importlib.import_module(
+            "apps.triage.migrations.0003_triagesession_result_summary"
+        )
+        session = self.add_session(diagnosis="Migraine")
+        TriageSession.objects.update(
+            severity="", confidence_score=None, diagnosis_summary="",
+        )
+
+        migration.backfill_result_summary(apps, None)
+
+        session.refresh_from_db()
+        self.assertEqual(
+            (session.severity, session.confidence_score, session.diagnosis_summary),
+            ("LOW", 0.6, "Migraine"),
+        )
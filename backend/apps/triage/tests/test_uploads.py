@@ -0,0 +1,113 @@
+import io
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.triage.models.triage_session import ImageAnalysis, TriageSession
+from apps.triage.services.triage_service import (
+    MAX_IMAGES_PER_UPLOAD,
+    TriageService,
+)
+from apps.users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def png(name: str = "rash.png") -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (2, 2)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_TASK_WORKERS=0)
+class SessionUploadTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("patient@example.com", "pw")
+        self.other = User.objects.create_user("other@example.com", "pw")
+        self.session = TriageService.create_session(
+            user=self.user, symptoms_text="itchy rash",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_result(self, session_id):
+        return self.client.post(
+            "/api/v1/triage/results/",
+            {
+                "session_id": str(session_id),
+                "diagnosis": "Contact dermatitis",
+                "severity": "LOW",
+                "confidence_score": 0.7,
+            },
+            format="json",
+        )
+
+    def post_image(self, session_id, **files):
+        return self.client.post(
+            "/api/v1/triage/images/",
+            {"session_id": str(session_id), **files},
+            format="multipart",
+        )
+
+    def test_result_is_saved_for_own_session(self):
+        self.assertEqual(self.post_result(self.session.id).status_code, 201)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, TriageSession.Status.COMPLETED)
+
+    def test_second_result_for_a_session_is_rejected(self):
+        self.assertEqual(self.post_result(self.session.id).status_code, 201)
+        self.assertEqual(self.post_result(self.session.id).status_code, 400)
+
+    def test_result_for_another_users_session_is_not_found(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.post_result(self.session.id).status_code, 404)
+
+    def test_image_is_saved_for_own_session(self):
+        response = self.post_image(self.session.id, image=png())
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(ImageAnalysis.objects.filter(pk=response.json()["id"]).exists())
+
+    def test_several_images_are_saved_in_one_request(self):
+        names = ["front.png", "back.png", "arm.png"]
+        images = [png(name) for name in names]
+        response = self.post_image(self.session.id, images=images)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(row["original_filename"] for row in response.json()["images"]),
+            sorted(names),
+        )
+        stored = ImageAnalysis.objects.filter(session=self.session)
+        self.assertEqual(stored.count(), 3)
+        for analysis in stored:
+            self.assertTrue(analysis.image.storage.exists(analysis.image.name))
+
+    def test_too_many_images_are_rejected(self):
+        images = [png() for _ in range(MAX_IMAGES_PER_UPLOAD + 1)]
+        response = self.post_image(self.session.id, images=images)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImageAnalysis.objects.exists())
+
+    def test_image_for_another_users_session_is_not_found(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.post_image(self.session.id, image=png()).status_code, 404)
+
+    def test_image_for_deleted_session_is_not_found(self):
+        TriageSession.objects.filter(pk=self.session.id).update(is_deleted=True)
+        self.assertEqual(self.post_image(self.session.id, image=png()).status_code, 404)
+        self.assertFalse(ImageAnalysis.objects.exists())
+
+    def test_image_for_missing_session_is_not_found(self):
+        session_id = self.session.id
+        self.session.delete()
+        self.assertEqual(self.post_image(session_id, image=png()).status_code, 404)
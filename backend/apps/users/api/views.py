@@ -33,7 +33,7 @@ class RegisterView(APIView):
                 resource_type="User",
                 resource_id=result["user"]["id"],
                 ip_address=self._get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+                user_agent=request.user_agent,
                 changes={"email": result["user"]["email"], "role": result["user"]["role"]},
             )
             return Response(result, status=status.HTTP_201_CREATED)
@@ -45,7 +45,7 @@ class RegisterView(APIView):
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
         if x_forwarded_for:
             return x_forwarded_for.split(",")[0].strip()
-        return request.META.get("REMOTE_ADDR")
+        return request.client_ip
 
 
 class LoginView(APIView):
@@ -65,7 +65,7 @@ class LoginView(APIView):
                 resource_type="User",
                 resource_id=result["user"]["id"],
                 ip_address=RegisterView._get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+                user_agent=request.user_agent,
             )
             return Response(result, status=status.HTTP_200_OK)
         except ValueError as e:
@@ -89,7 +89,7 @@ class LogoutView(APIView):
                 resource_type="User",
                 resource_id=str(request.user.id),
                 ip_address=RegisterView._get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+                user_agent=request.user_agent,
             )
             return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
         except ValueError as e:
@@ -132,7 +132,7 @@ class ProfileView(APIView):
             resource_type="User",
             resource_id=str(request.user.id),
             ip_address=RegisterView._get_client_ip(request),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            user_agent=request.user_agent,
             changes=serializer.validated_data,
         )
         return Response(profile, status=status.HTTP_200_OK)
@@ -51,7 +51,7 @@ class ExplanationView(APIView):
                 triage_result=session.result,
                 method="SHAP",
                 user=request.user,
-                ip_address=request.META.get("REMOTE_ADDR"),
+                ip_address=request.client_ip,
             )
             # Reload with prefetched contributions
             explanation = XAIService.get_explanation(session.result)
@@ -97,7 +97,7 @@ class ClinicalExplanationView(APIView):
                 triage_result=session.result,
                 method="SHAP",
                 user=request.user,
-                ip_address=request.META.get("REMOTE_ADDR"),
+                ip_address=request.client_ip,
             )
             explanation = XAIService.get_explanation(session.result)
 
@@ -155,7 +155,7 @@ class FeatureContributionsView(APIView):
                 triage_result=session.result,
                 method="SHAP",
                 user=request.user,
-                ip_address=request.META.get("REMOTE_ADDR"),
+                ip_address=request.client_ip,
             )
             explanation = XAIService.get_explanation(session.result)
 
@@ -202,8 +202,8 @@ class PrescriptionView(APIView):
             user=request.user,
             symptoms_text=data["symptoms_text"],
             triage_session=triage_session,
-            ip_address=request.META.get("REMOTE_ADDR"),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            ip_address=request.client_ip,
+            user_agent=request.user_agent,
         )
 
         return Response(
@@ -69,6 +69,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.common.middleware.ClientContextMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -104,6 +105,19 @@ DATABASES = {
     )
 }
 
+# Optional psycopg 3 connection pool (PostgreSQL only). Set DB_POOL_MAX_SIZE
+# to share a pool of warm connections across a worker's threads instead of
+# keeping one persistent connection per thread.
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=0, cast=int)
+
+_DB_ENGINE = DATABASES["default"]["ENGINE"]
+if DB_POOL_MAX_SIZE and _DB_ENGINE == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # The pool handles reuse
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+        "max_size": DB_POOL_MAX_SIZE,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Auth
@@ -138,7 +152,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "apps.common.pagination.StandardPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
+        "apps.common.renderers.OrjsonRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.common.parsers.OrjsonParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
@@ -182,6 +201,40 @@ CORS_ALLOW_CREDENTIALS = True
 FIELD_ENCRYPTION_KEY = config("FIELD_ENCRYPTION_KEY", default="")
 
 
+# ---------------------------------------------------------------------------
+# Background tasks
+# ---------------------------------------------------------------------------
+
+# Thread pool size for apps.common.background; 0 runs jobs inline.
+BACKGROUND_TASK_WORKERS = config("BACKGROUND_TASK_WORKERS", default=2, cast=int)
+
+# Separate pools for slow jobs, so they cannot starve audit/extraction work.
+BACKGROUND_TASK_QUEUES = {
+    "inference": config("INFERENCE_TASK_WORKERS", default=2, cast=int),
+}
+
+
+# ---------------------------------------------------------------------------
+# Cache – Redis when REDIS_URL is set, per-process memory otherwise
+# ---------------------------------------------------------------------------
+
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # ---------------------------------------------------------------------------
 # Internationalization
 # ---------------------------------------------------------------------------
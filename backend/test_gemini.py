@@ -1,18 +1,36 @@
+import argparse
+import time
 import traceback
 from decouple import config
 from google import genai
 
+parser = argparse.ArgumentParser(description="Check the Gemini API key works.")
+parser.add_argument("--count", type=int, default=1, help="number of requests to send")
+args = parser.parse_args()
+
 key = config("GEMINI_API_KEY")
 print(f"Key: {key[:12]}...")
 
-try:
-    client = genai.Client(api_key=key)
-    resp = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents="Say hi"
-    )
-    print("SUCCESS:", resp.text)
-except Exception as e:
-    print(f"ERROR TYPE: {type(e).__name__}")
-    print(f"ERROR: {e}")
-    traceback.print_exc()
+# One client for every request, so calls after the first reuse its
+# connection instead of paying for a new TLS handshake.
+client = genai.Client(api_key=key)
+
+done = 0
+started = time.perf_counter()
+for i in range(args.count):
+    try:
+        t0 = time.perf_counter()
+        resp = client.models.generate_content(
+            model="gemini-2.0-flash",
+            contents="Say hi"
+        )
+        print(f"[{i + 1}] SUCCESS in {time.perf_counter() - t0:.3f}s:", resp.text)
+        done += 1
+    except Exception as e:
+        print(f"ERROR TYPE: {type(e).__name__}")
+        print(f"ERROR: {e}")
+        traceback.print_exc()
+        break
+
+if done > 1:
+    print(f"{done} requests in {time.perf_counter() - started:.3f}s")
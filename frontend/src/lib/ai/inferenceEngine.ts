@@ -130,7 +130,7 @@ async function runServerInference(
             headers: { "Content-Type": "multipart/form-data" },
         });
 
-        return mapSessionToResult(session, "SERVER");
+        return mapSessionToResult(await waitForSession(session.id), "SERVER");
     }
 
     // Standard text inference
@@ -139,7 +139,27 @@ async function runServerInference(
         source,
     });
 
-    return mapSessionToResult(res.data, "SERVER");
+    return mapSessionToResult(await waitForSession(res.data.id), "SERVER");
+}
+
+const POLL_INTERVAL_MS = 1000;
+const POLL_TIMEOUT_MS = 90_000;
+
+/**
+ * Server inference runs in the background (the POST returns 202 with a
+ * PENDING session); poll the session until it completes or fails.
+ */
+async function waitForSession(sessionId: string): Promise<Record<string, unknown>> {
+    const deadline = Date.now() + POLL_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+        const res = await api.get(`/triage/sessions/${sessionId}/`);
+        if (res.data.status === "COMPLETED") return res.data;
+        if (res.data.status === "FAILED") {
+            throw new Error("Server inference failed.");
+        }
+        await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    }
+    throw new Error("Timed out waiting for server inference.");
 }
 
 // ------------------------------------------------------------------ //
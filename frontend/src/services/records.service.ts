@@ -21,6 +21,7 @@ export interface MedicalDocumentResponse {
     original_filename: string;
     file_size: number;
     extracted_text: string;
+    extraction_status: "PENDING" | "DONE" | "FAILED";
     created_at: string;
 }
 
@@ -37,8 +38,9 @@ export interface CreateRecordPayload {
 
 export const recordsService = {
     getRecords: (type?: string): Promise<{ data: { results: MedicalRecordResponse[] } }> => {
-        const params = type ? `?type=${type}` : "";
-        return api.get(`/records/${params}`);
+        // Record cards show description and data, which the list omits by default.
+        const params = type ? `&type=${type}` : "";
+        return api.get(`/records/?include_description=1${params}`);
     },
 
     getRecord: (id: string): Promise<{ data: MedicalRecordResponse }> =>
@@ -50,7 +52,9 @@ export const recordsService = {
     updateRecord: (
         id: string,
         data: Partial<CreateRecordPayload>
-    ): Promise<{ data: MedicalRecordResponse }> =>
+    ): Promise<{
+        data: Partial<MedicalRecordResponse> & Pick<MedicalRecordResponse, "id" | "updated_at">;
+    }> =>
         api.patch(`/records/${id}/`, data),
 
     deleteRecord: (id: string): Promise<void> =>
@@ -15,6 +15,8 @@ export interface TriageSessionResponse {
         recommendations: string[];
         differential_diagnoses: { condition: string; confidence: number }[];
         explainability: Record<string, unknown>;
+        /** Only present when requested with ?include=raw. */
+        raw_model_output?: unknown;
         created_at: string;
     } | null;
     images: {
@@ -27,8 +29,15 @@ export interface TriageSessionResponse {
     created_at: string;
 }
 
+/** Session list row: result summary only; fetch the session for the full result. */
+export interface TriageSessionSummary extends Omit<TriageSessionResponse, "result"> {
+    severity: string;
+    confidence_score: number | null;
+    diagnosis_summary: string;
+}
+
 export const triageService = {
-    getSessions: (): Promise<{ data: { results: TriageSessionResponse[] } }> =>
+    getSessions: (): Promise<{ data: { results: TriageSessionSummary[] } }> =>
         api.get("/triage/sessions/"),
 
     getSession: (id: string): Promise<{ data: TriageSessionResponse }> =>
@@ -54,6 +63,7 @@ export const triageService = {
     }): Promise<{ data: { id: string; status: string } }> =>
         api.post("/triage/results/", data),
 
+    // Returns 202 with the PENDING session; poll getSession() for the result.
     runServerInference: (data: {
         symptoms_text: string;
         source: string;
@@ -71,4 +81,18 @@ export const triageService = {
             headers: { "Content-Type": "multipart/form-data" },
         });
     },
+
+    uploadImages: (
+        sessionId: string,
+        images: File[]
+    ): Promise<{
+        data: { images: { id: string; original_filename: string }[]; status: string };
+    }> => {
+        const formData = new FormData();
+        formData.append("session_id", sessionId);
+        images.forEach((image) => formData.append("images", image));
+        return api.post("/triage/images/", formData, {
+            headers: { "Content-Type": "multipart/form-data" },
+        });
+    },
 };